@@ -28,8 +28,10 @@ if is_dev:
 # target_metadata = mymodel.Base.metadata
 
 from components.documents.infrastructure.orm import metadata as documents_metadata
+from components.shared.infrastructure.orm import metadata as shared_metadata
+from components.summary.infrastructure.orm import metadata as summary_metadata
 
-target_metadata = [documents_metadata]
+target_metadata = [documents_metadata, summary_metadata, shared_metadata]
 
 # other values from the config, defined by the needs of env.py,
 # can be acquired:
@@ -0,0 +1,31 @@
+"""add summary source to documents
+
+Revision ID: 3e7d9a2c5f10
+Revises: 8c4f2e6b1a37
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "3e7d9a2c5f10"
+down_revision = "8c4f2e6b1a37"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "documents",
+        sa.Column("summary_content_hash", sa.String(length=64), nullable=True),
+    )
+    op.add_column(
+        "documents", sa.Column("summary_source_html", sa.Text(), nullable=True)
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("documents", "summary_source_html")
+    op.drop_column("documents", "summary_content_hash")
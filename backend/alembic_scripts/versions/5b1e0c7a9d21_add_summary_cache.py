@@ -0,0 +1,31 @@
+"""add summary cache
+
+Revision ID: 5b1e0c7a9d21
+Revises: 12748679d72e
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "5b1e0c7a9d21"
+down_revision = "12748679d72e"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "summary_cache",
+        sa.Column("key", sa.String(length=64), nullable=False),
+        sa.Column("summary_html", sa.Text(), nullable=False),
+        sa.Column("model", sa.String(length=255), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint("key"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("summary_cache")
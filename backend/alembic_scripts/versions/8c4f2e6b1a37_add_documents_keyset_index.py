@@ -0,0 +1,28 @@
+"""add documents keyset index
+
+Revision ID: 8c4f2e6b1a37
+Revises: 5b1e0c7a9d21
+Create Date: 2026-10-18 00:00:00.000000
+
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "8c4f2e6b1a37"
+down_revision = "5b1e0c7a9d21"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "idx_documents_created_at_id_search",
+        "documents",
+        ["created_at", "id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("idx_documents_created_at_id_search", table_name="documents")
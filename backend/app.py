@@ -5,7 +5,9 @@ from flask import Flask, Response, g, request, stream_with_context
 from flask_compress import Compress
 from flask_cors import CORS
 from flask_restx import Api, Namespace, Resource, fields
+from pydantic import ValidationError
 
+from celery_app import celery_init_app
 from components.documents.infrastructure.orm import (
     start_mappers as start_documents_mappers,
 )
@@ -33,6 +35,13 @@ summaries_ns = Namespace(
     "summaries", path="/api/documents", description="Document summaries & streaming"
 )
 
+
+@documents_ns.errorhandler(ValidationError)
+def handle_validation_error(error: ValidationError):
+    # RESTX answers errors itself, so the app-level 400 mapping never applies
+    return {"message": str(error)}, 400
+
+
 # Models
 create_document_model = documents_ns.model(
     "CreateDocument",
@@ -50,30 +59,90 @@ document_model = documents_ns.model(
         "summary_html": fields.String,
     },
 )
+document_list_item_model = documents_ns.model(
+    "DocumentListItem",
+    {
+        "id": fields.String,
+        "title": fields.String,
+        "created_at": fields.DateTime,
+        "has_summary": fields.Boolean,
+        "content_html": fields.String,
+        "summary_html": fields.String,
+    },
+)
+document_page_model = documents_ns.model(
+    "DocumentPage",
+    {
+        "items": fields.List(fields.Nested(document_list_item_model)),
+        "next_cursor": fields.String,
+    },
+)
+bulk_upsert_documents_model = documents_ns.model(
+    "BulkUpsertDocuments",
+    {
+        "items": fields.List(
+            fields.Nested(
+                documents_ns.model(
+                    "BulkUpsertDocumentItem",
+                    {
+                        "id": fields.String,
+                        "title": fields.String(required=True),
+                        "content_html": fields.String(required=True),
+                    },
+                )
+            ),
+            required=True,
+        )
+    },
+)
+bulk_upsert_result_model = documents_ns.model(
+    "BulkUpsertResult",
+    {
+        "items": fields.List(fields.Raw),
+        "errors": fields.List(fields.Raw),
+    },
+)
 summary_model = summaries_ns.model(
     "Summary", {"document_id": fields.String, "summary_html": fields.String}
 )
 summary_save_model = summaries_ns.model(
-    "SaveSummary", {"content_html": fields.String(required=True)}
+    "SaveSummary",
+    {
+        "content_html": fields.String(required=True),
+        "source_hash": fields.String(
+            description="source_hash from the generating stream's done event"
+        ),
+    },
 )
 
 
 # Documents endpoints
 @documents_ns.route("/")
 class DocumentsCollection(Resource):
-    @documents_ns.marshal_with(
-        documents_ns.model(
-            "DocumentList", {"items": fields.List(fields.Nested(document_model))}
-        )
+    @documents_ns.doc(
+        params={
+            "limit": "Page size (1-200, default 50)",
+            "cursor": "Opaque cursor from the previous page's next_cursor",
+            "fields": "'full' (default) or 'summary' for id/title/created_at/has_summary",
+            "include_archived": "Include soft-deleted documents",
+        }
     )
+    @documents_ns.response(200, "Success", document_page_model)
     def get(self):
         from components.documents.application import views
-        from components.documents.user_interface.bus import bus_factory
-
-        bus = bus_factory()
-        with bus.uow as uow:
-            items = views.get_document_collection(uow.session)
-            return {"items": items}, 200
+        from components.documents.user_interface.bus import read_only_uow_factory
+        from components.documents.user_interface.http import schemas
+
+        query = schemas.ListDocumentsQuery(**request.args.to_dict())
+        with read_only_uow_factory() as uow:
+            page = views.get_document_collection(
+                uow.session,
+                limit=query.limit,
+                cursor=query.cursor,
+                projection=query.projection,
+                include_archived=query.include_archived,
+            )
+            return page, 200
 
     @documents_ns.expect(create_document_model)
     @documents_ns.marshal_with(document_model, code=201)
@@ -88,12 +157,40 @@ class DocumentsCollection(Resource):
                 title=payload["title"], content_html=payload["content_html"]
             )
         )
-        doc_id = bus.results.pop()
-        with bus.uow as uow:
-            from components.documents.application import views
+        return bus.results.pop(), 201
 
-            doc = views.get_document_scalar(uow.session, doc_id)
-            return doc, 201
+
+@documents_ns.route("/bulk")
+class DocumentsBulk(Resource):
+    @documents_ns.expect(bulk_upsert_documents_model)
+    @documents_ns.response(200, "Success", bulk_upsert_result_model)
+    def post(self):
+        from components.documents.domain import commands
+        from components.documents.user_interface.bus import bus_factory
+        from components.documents.user_interface.http import schemas
+
+        payload = schemas.BulkUpsertDocumentsRequest(
+            **(request.get_json(silent=True) or {})
+        )
+        bus = bus_factory()
+        bus.handle(commands.BulkUpsertDocuments(items=payload.items))
+        return bus.results.pop(), 200
+
+
+@documents_ns.route("/export")
+class DocumentsExport(Resource):
+    @documents_ns.doc(
+        params={
+            "include_archived": "Include soft-deleted documents",
+            "gzip": "Gzip the NDJSON stream",
+        }
+    )
+    def get(self):
+        from components.documents.user_interface.http.documents_api import (
+            export_documents,
+        )
+
+        return export_documents()
 
 
 @documents_ns.route("/<string:document_id>")
@@ -103,10 +200,9 @@ class DocumentResource(Resource):
         from uuid import UUID
 
         from components.documents.application import views
-        from components.documents.user_interface.bus import bus_factory
+        from components.documents.user_interface.bus import read_only_uow_factory
 
-        bus = bus_factory()
-        with bus.uow as uow:
+        with read_only_uow_factory() as uow:
             doc = views.get_document_scalar(uow.session, UUID(document_id))
             return doc, 200
 
@@ -115,7 +211,6 @@ class DocumentResource(Resource):
     def put(self, document_id):
         from uuid import UUID
 
-        from components.documents.application import views
         from components.documents.domain import commands
         from components.documents.user_interface.bus import bus_factory
 
@@ -128,9 +223,7 @@ class DocumentResource(Resource):
                 content_html=payload["content_html"],
             )
         )
-        with bus.uow as uow:
-            doc = views.get_document_scalar(uow.session, UUID(document_id))
-            return doc, 200
+        return bus.results.pop(), 200
 
     def delete(self, document_id):
         from uuid import UUID
@@ -150,10 +243,9 @@ class SummaryResource(Resource):
     def get(self, document_id):
         from uuid import UUID
 
-        from components.summary.user_interface.bus import bus_factory
+        from components.summary.user_interface.bus import read_only_uow_factory
 
-        bus = bus_factory()
-        with bus.uow as uow:
+        with read_only_uow_factory() as uow:
             doc = uow.repositories.documents.get(UUID(document_id))
             return {
                 "document_id": document_id,
@@ -171,7 +263,9 @@ class SummaryResource(Resource):
         bus = bus_factory()
         bus.handle(
             scmd.SaveSummary(
-                document_id=UUID(document_id), content_html=payload["content_html"]
+                document_id=UUID(document_id),
+                content_html=payload["content_html"],
+                source_hash=payload.get("source_hash"),
             )
         )
         return "", 201
@@ -187,7 +281,9 @@ class SummaryResource(Resource):
         bus = bus_factory()
         bus.handle(
             scmd.UpdateSummary(
-                document_id=UUID(document_id), content_html=payload["content_html"]
+                document_id=UUID(document_id),
+                content_html=payload["content_html"],
+                source_hash=payload.get("source_hash"),
             )
         )
         return "", 200
@@ -215,6 +311,44 @@ class SummaryStream(Resource):
         return stream_summary(UUID(document_id))
 
 
+@summaries_ns.route("/<string:document_id>/summary/jobs")
+class SummaryJobs(Resource):
+    def post(self, document_id: str):
+        from uuid import UUID
+
+        from components.summary.user_interface import tasks
+        from components.summary.user_interface.http.summary_api import job_payload
+
+        options = request.get_json(silent=True) or {}
+        job = tasks.enqueue_summary_job(UUID(document_id), options)
+        return job_payload(job), 202
+
+
+@summaries_ns.route("/<string:document_id>/summary/jobs/<string:job_id>")
+class SummaryJob(Resource):
+    def get(self, document_id: str, job_id: str):
+        from uuid import UUID
+
+        from components.summary.user_interface.http.summary_api import (
+            find_summary_job,
+            job_payload,
+        )
+
+        return job_payload(find_summary_job(UUID(document_id), UUID(job_id))), 200
+
+
+@summaries_ns.route("/<string:document_id>/summary/jobs/<string:job_id>/stream")
+class SummaryJobStream(Resource):
+    def get(self, document_id: str, job_id: str):
+        from uuid import UUID
+
+        from components.summary.user_interface.http.summary_api import (
+            stream_summary_job,
+        )
+
+        return stream_summary_job(UUID(document_id), UUID(job_id))
+
+
 def register_blueprints(flask_app: Flask):
     logger.info("registering blueprint")
     flask_app.register_blueprint(documents_blueprint)
@@ -247,6 +381,22 @@ def set_compression(flask_app: Flask) -> Flask:
     return flask_app
 
 
+def set_celery(flask_app: Flask) -> Flask:
+    # Without a broker, summary jobs fall back to in-process threads
+    broker_url = env.str("CELERY_BROKER_URL", "")
+    if not broker_url:
+        return flask_app
+    flask_app.config.from_mapping(
+        CELERY=dict(
+            broker_url=broker_url,
+            result_backend=env.str("CELERY_RESULT_BACKEND", broker_url),
+            task_ignore_result=True,
+        )
+    )
+    celery_init_app(flask_app)
+    return flask_app
+
+
 def start_mappers() -> None:
     start_documents_mappers()
 
@@ -274,6 +424,7 @@ def create_app(import_name: str) -> Flask:
     flask_app = set_middlewares(flask_app)
     flask_app = set_cors(flask_app)
     flask_app = set_compression(flask_app)
+    flask_app = set_celery(flask_app)
 
     return flask_app
 
@@ -0,0 +1,2 @@
+# ASGI app for summary SSE streams, e.g. `uvicorn asgi:app --port 3004`
+from components.summary.user_interface.asgi import app  # noqa: F401
@@ -1,7 +1,10 @@
-from components.documents.application import errors
+from pydantic import ValidationError
+
+from components.documents.application import dto, errors
 from components.documents.domain import commands, models
 from components.shared.application.base import UnitOfWorkInterface
 from components.shared.domain.base import LoggerInterface
+from components.shared.domain.errors import EntityNotFound
 
 
 class DocumentsService:
@@ -13,15 +16,18 @@ class DocumentsService:
     ):
         with uow:
             logger.info(f"Creating document: {command.title}")
-            document = models.Document(
+            document = models.Document.create(
                 title=command.title, content_html=command.content_html
             )
 
             uow.repositories.documents.save(document)
+            # Serialize before commit: committing expires the entity and reading
+            # it afterwards would cost another SELECT.
+            persisted = dto.Document().dump(document)
             uow.commit()
 
             logger.info(f"Document created: {document.id}")
-            return document.id
+            return persisted
 
     @staticmethod
     def update_document(
@@ -38,8 +44,10 @@ class DocumentsService:
             document.update(command.title, command.content_html)
 
             uow.repositories.documents.save(document)
+            persisted = dto.Document().dump(document)
             uow.commit()
             logger.info(f"Document updated: {document.id}")
+            return persisted
 
     @staticmethod
     def soft_delete_document(
@@ -58,3 +66,65 @@ class DocumentsService:
             uow.repositories.documents.save(document)
             uow.commit()
             logger.info(f"Document soft deleted: {document.id}")
+
+    @staticmethod
+    def bulk_upsert_documents(
+        command: commands.BulkUpsertDocuments,
+        uow: UnitOfWorkInterface,
+        logger: LoggerInterface,
+    ):
+        results, item_errors = [], []
+        creates, updates = [], []
+        for index, item in enumerate(command.items):
+            try:
+                if item.get("id"):
+                    updates.append((index, commands.UpdateDocument(**item)))
+                else:
+                    creates.append((index, commands.CreateDocument(**item)))
+            except ValidationError as e:
+                item_errors.append({"index": index, "error": str(e)})
+
+        with uow:
+            logger.info(
+                f"Bulk upserting documents: {len(creates)} new, {len(updates)} updates"
+            )
+            new_documents = [
+                models.Document.create(title=item.title, content_html=item.content_html)
+                for _, item in creates
+            ]
+            if new_documents:
+                uow.repositories.documents.bulk_insert(new_documents)
+            results.extend(
+                {"index": index, "id": str(document.id)}
+                for (index, _), document in zip(creates, new_documents)
+            )
+
+            existing = (
+                {
+                    document.id: document
+                    for document in uow.repositories.documents.get_many_by_ids(
+                        [item.id for _, item in updates]
+                    )
+                }
+                if updates
+                else {}
+            )
+            for index, item in updates:
+                document = existing.get(item.id)
+                try:
+                    if not document:
+                        raise errors.DocumentNotFound(item.id)
+                    document.update(item.title, item.content_html)
+                except EntityNotFound as e:
+                    item_errors.append({"index": index, "error": str(e)})
+                    continue
+                results.append({"index": index, "id": str(document.id)})
+
+            uow.commit()
+            logger.info(
+                f"Bulk upsert done: {len(results)} saved, {len(item_errors)} failed"
+            )
+
+        results.sort(key=lambda result: result["index"])
+        item_errors.sort(key=lambda error: error["index"])
+        return {"items": results, "errors": item_errors}
@@ -1,9 +1,29 @@
+from datetime import UTC
+
 from marshmallow import Schema, fields
 
 
+class UtcDateTime(fields.DateTime):
+    """Naive UTC, as the columns store it. Entities not yet reloaded still hold
+    aware values; dropping the offset keeps create/update responses in the
+    same format as reads."""
+
+    def _serialize(self, value, attr, obj, **kwargs):
+        if value is not None and value.tzinfo is not None:
+            value = value.astimezone(UTC).replace(tzinfo=None)
+        return super()._serialize(value, attr, obj, **kwargs)
+
+
 class Document(Schema):
     id = fields.Str()
     title = fields.Str()
     content_html = fields.Str()
     summary_html = fields.Str(allow_none=True)
-    created_at = fields.DateTime()
+    created_at = UtcDateTime()
+
+
+class DocumentListItem(Schema):
+    id = fields.Str()
+    title = fields.Str()
+    created_at = UtcDateTime()
+    has_summary = fields.Bool()
@@ -1,8 +1,14 @@
 import uuid
 
+from components.shared.application.errors import ApplicationError
 from components.shared.domain.errors import EntityNotFound
 
 
 class DocumentNotFound(EntityNotFound):
     def __init__(self, document_id: uuid.UUID):
         self.message = f"Document with id {document_id} not found"
+
+
+class InvalidCursor(ApplicationError):
+    def __init__(self, cursor: str):
+        self.message = f"Invalid pagination cursor {cursor}"
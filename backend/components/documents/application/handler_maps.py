@@ -1,10 +1,18 @@
 from components.documents.application.documents_service import DocumentsService
-from components.documents.domain import commands
+from components.documents.domain import commands, events
 
 EVENT_HANDLER_MAPS = {}
 
+# Events published through the outbox, by broker topic
+EVENT_TOPIC_MAPS = {
+    events.DocumentCreated: "documents",
+    events.DocumentUpdated: "documents",
+    events.DocumentArchived: "documents",
+}
+
 COMMAND_HANDLER_MAPS = {
     commands.CreateDocument: DocumentsService.create_document,
     commands.UpdateDocument: DocumentsService.update_document,
     commands.SoftDeleteDocument: DocumentsService.soft_delete_document,
+    commands.BulkUpsertDocuments: DocumentsService.bulk_upsert_documents,
 }
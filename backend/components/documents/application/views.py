@@ -1,15 +1,115 @@
-from typing import Optional
+import base64
+import binascii
+from datetime import datetime
+from typing import Iterator, Optional
 from uuid import UUID
 
+from sqlalchemy import tuple_
 from sqlalchemy.orm import Session, aliased, joinedload
 
-from components.documents.application import dto
+from components.documents.application import dto, errors
 from components.documents.domain import models
 
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
 
-def get_document_collection(session: Session) -> list:
-    documents = session.query(models.Document).all()
-    return dto.Document(many=True).dump(documents)
+EXPORT_BATCH_SIZE = 500
+
+PROJECTION_FULL = "full"
+PROJECTION_SUMMARY = "summary"
+
+
+def encode_cursor(created_at: datetime, document_id: UUID) -> str:
+    raw = f"{created_at.isoformat()}|{document_id}".encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, UUID]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode("ascii")).decode("utf-8")
+        created_at, document_id = raw.split("|", 1)
+        return datetime.fromisoformat(created_at), UUID(document_id)
+    except (binascii.Error, UnicodeError, ValueError):
+        raise errors.InvalidCursor(cursor)
+
+
+def get_document_collection(
+    session: Session,
+    limit: int = DEFAULT_PAGE_SIZE,
+    cursor: Optional[str] = None,
+    projection: str = PROJECTION_FULL,
+    include_archived: bool = False,
+) -> dict:
+    """Newest-first page of documents using keyset pagination on (created_at, id).
+
+    The ``summary`` projection only selects list columns, so ``content_html``
+    and ``summary_html`` are never read from the database for list views.
+    """
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+    document = models.Document
+
+    if projection == PROJECTION_SUMMARY:
+        query = session.query(
+            document.id,
+            document.title,
+            document.created_at,
+            document.summary_html.isnot(None).label("has_summary"),
+        )
+        schema = dto.DocumentListItem(many=True)
+    else:
+        query = session.query(document)
+        schema = dto.Document(many=True)
+
+    if not include_archived:
+        query = query.filter(document.archived_at.is_(None))
+    if cursor:
+        created_at, document_id = decode_cursor(cursor)
+        query = query.filter(
+            tuple_(document.created_at, document.id) < (created_at, document_id)
+        )
+
+    rows = (
+        query.order_by(document.created_at.desc(), document.id.desc())
+        .limit(limit + 1)
+        .all()
+    )
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1].created_at, rows[-1].id)
+
+    return {"items": schema.dump(rows), "next_cursor": next_cursor}
+
+
+def iter_document_export(
+    session: Session,
+    include_archived: bool = False,
+    batch_size: int = EXPORT_BATCH_SIZE,
+) -> Iterator[dict]:
+    """Yield every document through a server-side cursor, ``batch_size`` rows at a time.
+
+    Columns are selected instead of entities so rows never enter the session's
+    identity map and memory stays flat however many documents the tenant has.
+    """
+    document = models.Document
+    query = session.query(
+        document.id,
+        document.title,
+        document.content_html,
+        document.summary_html,
+        document.created_at,
+    )
+    if not include_archived:
+        query = query.filter(document.archived_at.is_(None))
+
+    schema = dto.Document()
+    rows = (
+        query.order_by(document.created_at, document.id)
+        .execution_options(stream_results=True)
+        .yield_per(batch_size)
+    )
+    for row in rows:
+        yield schema.dump(row)
 
 
 def get_document_scalar(session: Session, document_id: UUID) -> Optional[dict]:
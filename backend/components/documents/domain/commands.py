@@ -1,6 +1,6 @@
 import uuid
 
-from pydantic import constr
+from pydantic import conlist, constr
 
 from components.shared.domain.base import Command
 
@@ -18,3 +18,9 @@ class UpdateDocument(Command):
 
 class SoftDeleteDocument(Command):
     id: uuid.UUID
+
+
+class BulkUpsertDocuments(Command):
+    # Items are validated one by one by the handler so a bad item is reported
+    # back instead of rejecting the whole batch. Items with an "id" update.
+    items: conlist(dict, min_items=1, max_items=1000)
@@ -0,0 +1,22 @@
+from components.shared.domain.base import Event
+
+
+class DocumentCreated(Event):
+    _name = "documents.document_created"
+
+    def __init__(self, document_id: str):
+        self.document_id = document_id
+
+
+class DocumentUpdated(Event):
+    _name = "documents.document_updated"
+
+    def __init__(self, document_id: str):
+        self.document_id = document_id
+
+
+class DocumentArchived(Event):
+    _name = "documents.document_archived"
+
+    def __init__(self, document_id: str):
+        self.document_id = document_id
@@ -3,7 +3,7 @@ from dataclasses import dataclass, field
 from datetime import UTC, datetime
 from typing import Optional
 
-from components.documents.domain import errors
+from components.documents.domain import errors, events
 from components.shared.domain.base import Entity
 
 
@@ -13,16 +13,39 @@ class Document(Entity):
     title: str
     content_html: str
     summary_html: Optional[str] = None  # New: persisted summary
+    # Content the summary was generated from, for incremental regeneration
+    summary_content_hash: Optional[str] = None
+    summary_source_html: Optional[str] = None
     created_at: datetime = field(default_factory=lambda: datetime.now(UTC))
     archived_at: Optional[datetime] = None
 
+    @classmethod
+    def create(cls, title: str, content_html: str) -> "Document":
+        document = cls(title=title, content_html=content_html)
+        document.raise_event(events.DocumentCreated(str(document.id)))
+        return document
+
     def update(self, title: str, content_html: str) -> None:
         if self.archived_at:
             raise errors.CannotUpdateArchivedDocument(self.id)
         self.title = title
         self.content_html = content_html
+        self.raise_event(events.DocumentUpdated(str(self.id)))
 
     def soft_delete(self) -> None:
         if self.archived_at:
             raise errors.CannotUpdateArchivedDocument(self.id)
         self.archived_at = datetime.now(UTC)
+        self.raise_event(events.DocumentArchived(str(self.id)))
+
+    def set_summary(
+        self, summary_html: str, content_hash: str, source_html: Optional[str]
+    ) -> None:
+        self.summary_html = summary_html
+        self.summary_content_hash = content_hash
+        self.summary_source_html = source_html
+
+    def clear_summary(self) -> None:
+        self.summary_html = None
+        self.summary_content_hash = None
+        self.summary_source_html = None
@@ -28,10 +28,13 @@ document_table = Table(
     Column("title", String(length=255), nullable=False),
     Column("content_html", String, nullable=False),
     Column("summary_html", Text, nullable=True),
+    Column("summary_content_hash", String(length=64), nullable=True),
+    Column("summary_source_html", Text, nullable=True),
     Column("created_at", DateTime, nullable=False),
     Column("archived_at", DateTime, nullable=True),
     Index("idx_documents_id_search", "id"),
     Index("idx_documents_archived_at_search", "archived_at"),
+    Index("idx_documents_created_at_id_search", "created_at", "id"),
 )
 
 
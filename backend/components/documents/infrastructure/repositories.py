@@ -1,3 +1,5 @@
+from dataclasses import asdict
+from typing import List
 from uuid import UUID
 
 from components.documents.domain import models
@@ -9,3 +11,12 @@ from components.shared.infrastructure.sqlalchemy_base import (
 class DocumentRepository(SQLAlchemyAbstractRepository):
     model = models.Document
     seen: set[models.Document]
+
+    def bulk_insert(self, documents: List[models.Document]) -> None:
+        # executemany in one round trip; rows are not tracked by the session,
+        # but the repository tracks them so their events are still collected
+        self.session.bulk_insert_mappings(
+            self.model, [asdict(document) for document in documents]
+        )
+        for document in documents:
+            self._track(document)
@@ -2,3 +2,4 @@ from components.documents.bootstrapper import Bootstrapper
 
 bootstrapper = Bootstrapper()
 bus_factory = bootstrapper.bootstrap_factory()
+read_only_uow_factory = bootstrapper.read_only_uow_factory()
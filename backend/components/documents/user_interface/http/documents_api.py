@@ -1,12 +1,16 @@
+import json
 from uuid import UUID
 
-from flask import Blueprint, jsonify
+from flask import Blueprint, Response, jsonify, request, stream_with_context
 
 from components.documents.application import views
 from components.documents.domain import commands
-from components.documents.user_interface.bus import bus_factory
+from components.documents.user_interface.bus import (
+    bus_factory,
+    read_only_uow_factory,
+)
 from components.documents.user_interface.http import schemas
-from components.shared.user_interface.utils import parse_with_for_http
+from components.shared.user_interface.utils import gzip_stream, parse_with_for_http
 
 documents_blueprint = Blueprint("documents", __name__, url_prefix="/api/documents")
 
@@ -19,10 +23,18 @@ def create_document(payload: commands.CreateDocument):
         commands.CreateDocument(title=payload.title, content_html=payload.content_html)
     )
 
-    document_id = bus.results.pop()
-    with bus.uow as uow:
-        document = views.get_document_scalar(uow.session, document_id)
-        return jsonify(document), 201
+    document = bus.results.pop()
+    return jsonify(document), 201
+
+
+@documents_blueprint.post("/bulk")
+@parse_with_for_http(schemas.BulkUpsertDocumentsRequest)
+def bulk_upsert_documents(payload: schemas.BulkUpsertDocumentsRequest):
+    bus = bus_factory()
+    bus.handle(commands.BulkUpsertDocuments(items=payload.items))
+
+    result = bus.results.pop()
+    return jsonify(result), 200
 
 
 @documents_blueprint.put("/<uuid:document_id>")
@@ -35,9 +47,8 @@ def update_document(document_id: UUID, payload: commands.UpdateDocument):
         )
     )
 
-    with bus.uow as uow:
-        document = views.get_document_scalar(uow.session, document_id)
-        return jsonify(document), 200
+    document = bus.results.pop()
+    return jsonify(document), 200
 
 
 @documents_blueprint.delete("/<uuid:document_id>")
@@ -50,15 +61,47 @@ def soft_delete_document(document_id: UUID):
 
 @documents_blueprint.get("/<uuid:document_id>")
 def get_document_scalar(document_id: UUID):
-    bus = bus_factory()
-    with bus.uow as uow:
+    with read_only_uow_factory() as uow:
         document = views.get_document_scalar(uow.session, document_id)
         return jsonify(document), 200
 
 
 @documents_blueprint.get("/")
 def get_document_collection():
-    bus = bus_factory()
-    with bus.uow as uow:
-        documents = views.get_document_collection(uow.session)
-        return jsonify({"items": documents}), 200
+    query = schemas.ListDocumentsQuery(**request.args.to_dict())
+    with read_only_uow_factory() as uow:
+        page = views.get_document_collection(
+            uow.session,
+            limit=query.limit,
+            cursor=query.cursor,
+            projection=query.projection,
+            include_archived=query.include_archived,
+        )
+        return jsonify(page), 200
+
+
+@documents_blueprint.get("/export")
+def export_documents():
+    query = schemas.ExportDocumentsQuery(**request.args.to_dict())
+
+    def ndjson_stream():
+        with read_only_uow_factory() as uow:
+            for document in views.iter_document_export(
+                uow.session, include_archived=query.include_archived
+            ):
+                yield json.dumps(document) + "\n"
+
+    body = stream_with_context(ndjson_stream())
+    headers = {
+        "Content-Type": "application/x-ndjson",
+        "Content-Disposition": "attachment; filename=documents.ndjson",
+        "X-Accel-Buffering": "no",
+    }
+    if query.gzip:
+        body = gzip_stream(body)
+        headers["Content-Encoding"] = "gzip"
+
+    response = Response(body, headers=headers)
+    # Keep Flask-Compress from buffering the whole stream to compress it
+    response.direct_passthrough = True
+    return response
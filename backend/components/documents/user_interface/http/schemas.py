@@ -1,7 +1,9 @@
 from typing import Dict, List, Literal, Optional
 from uuid import UUID
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field, conint
+
+from components.documents.application import views
 
 
 class CreateDocumentRequest(BaseModel):
@@ -11,3 +13,21 @@ class CreateDocumentRequest(BaseModel):
 
 class UpdateDocumentRequest(CreateDocumentRequest):
     pass
+
+
+class BulkUpsertDocumentsRequest(BaseModel):
+    items: List[Dict]
+
+
+class ListDocumentsQuery(BaseModel):
+    limit: conint(ge=1, le=views.MAX_PAGE_SIZE) = views.DEFAULT_PAGE_SIZE
+    cursor: Optional[str] = None
+    projection: Literal["full", "summary"] = Field(
+        views.PROJECTION_FULL, alias="fields"
+    )
+    include_archived: bool = False
+
+
+class ExportDocumentsQuery(BaseModel):
+    include_archived: bool = False
+    gzip: bool = False
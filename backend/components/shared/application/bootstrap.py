@@ -0,0 +1,73 @@
+import inspect
+from collections.abc import Mapping
+from functools import partial
+from typing import Any, Callable, Dict, Iterable, List, Type
+
+INJECTABLE_DEPENDENCIES = ("uow", "logger")
+
+
+def _injected_params(handler: Callable, injectable: Iterable[str]) -> tuple:
+    params = inspect.signature(handler).parameters
+    return tuple(name for name in injectable if name in params)
+
+
+def _inject(handler: Callable, names: tuple, dependencies: dict) -> Callable:
+    return partial(handler, **{name: dependencies[name] for name in names})
+
+
+class _BoundHandlers(Mapping):
+    """Read-only view of compiled handlers bound to one bus's dependencies.
+
+    Handlers are bound on lookup, so a bus only pays for the handlers its
+    messages actually reach.
+    """
+
+    def __init__(self, compiled: dict, dependencies: dict, many: bool):
+        self._compiled = compiled
+        self._dependencies = dependencies
+        self._many = many
+
+    def __getitem__(self, message_type):
+        entry = self._compiled[message_type]
+        if self._many:
+            return [_inject(h, names, self._dependencies) for h, names in entry]
+        return _inject(*entry, self._dependencies)
+
+    def __iter__(self):
+        return iter(self._compiled)
+
+    def __len__(self) -> int:
+        return len(self._compiled)
+
+
+class CompiledHandlers:
+    """Handler maps with their injectable parameters resolved once.
+
+    Build one per component at import time; ``bind`` then returns the
+    command and event handler maps for a bus without inspecting signatures
+    again.
+    """
+
+    def __init__(
+        self,
+        command_handler_maps: Dict[Type, Callable],
+        event_handler_maps: Dict[Type, List[Callable]],
+        injectable: Iterable[str] = INJECTABLE_DEPENDENCIES,
+    ):
+        injectable = tuple(injectable)
+        self._commands = {
+            command_type: (handler, _injected_params(handler, injectable))
+            for command_type, handler in command_handler_maps.items()
+        }
+        self._events = {
+            event_type: [
+                (handler, _injected_params(handler, injectable)) for handler in handlers
+            ]
+            for event_type, handlers in event_handler_maps.items()
+        }
+
+    def bind(self, dependencies: Dict[str, Any]) -> tuple[Mapping, Mapping]:
+        return (
+            _BoundHandlers(self._commands, dependencies, many=False),
+            _BoundHandlers(self._events, dependencies, many=True),
+        )
@@ -15,6 +15,10 @@ class ApplicationError(RuntimeError):
         return self.message
 
 
+class ReadOnlyUnitOfWorkCommit(ApplicationError):
+    message = "A read-only unit of work cannot commit"
+
+
 class UnknownMessageBusMessageType(ApplicationError):
     def __init__(self, message):
         self.message = f"{message} is not an Event or Command"
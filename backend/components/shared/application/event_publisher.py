@@ -0,0 +1,49 @@
+import abc
+import os
+import threading
+from collections import deque
+from typing import Deque, Dict, List, Optional
+
+
+class EventPublisher(abc.ABC):
+    @abc.abstractmethod
+    def publish(self, topic: str, messages: List[dict]) -> None:
+        """Deliver ``messages`` to ``topic`` in order.
+
+        Raises EventPublisherError when the broker did not accept them.
+        """
+        raise NotImplementedError
+
+
+class InMemoryEventPublisher(EventPublisher):
+    """Local stand-in for a broker: keeps the latest messages per topic."""
+
+    def __init__(self, max_messages: Optional[int] = None):
+        self._max_messages = max_messages or int(
+            os.getenv("EVENT_STREAM_MAXLEN", "10000")
+        )
+        self._topics: Dict[str, Deque[dict]] = {}
+        self._lock = threading.Lock()
+
+    def publish(self, topic: str, messages: List[dict]) -> None:
+        with self._lock:
+            stream = self._topics.setdefault(topic, deque(maxlen=self._max_messages))
+            stream.extend(messages)
+
+    def messages(self, topic: str) -> List[dict]:
+        with self._lock:
+            return list(self._topics.get(topic, ()))
+
+
+def build_event_publisher(backend: Optional[str] = None) -> EventPublisher:
+    backend = (backend or os.getenv("EVENT_PUBLISHER_BACKEND", "memory")).lower()
+    if backend == "redis":
+        from components.shared.infrastructure.event_publisher import (
+            RedisStreamEventPublisher,
+        )
+
+        return RedisStreamEventPublisher(
+            os.getenv("EVENT_PUBLISHER_REDIS_URL")
+            or os.getenv("CELERY_BROKER_URL", "redis://localhost:6379/0")
+        )
+    return InMemoryEventPublisher()
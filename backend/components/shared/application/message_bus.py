@@ -1,4 +1,5 @@
-from typing import Callable, Dict, List, Type, Union
+from collections import deque
+from typing import Callable, Deque, Dict, List, Type, Union
 
 from components.shared.application.base import UnitOfWorkInterface
 from components.shared.application.errors import UnknownMessageBusMessageType
@@ -19,13 +20,13 @@ class MessageBus:
         self.logger = logger
         self.event_handlers = event_handlers
         self.command_handlers = command_handlers
-        self._queue = []
+        self._queue: Deque[Message] = deque()
         self.results = []
 
     def handle(self, message: Message) -> None:
         self._queue.append(message)
         while self._queue:
-            message = self._queue.pop(0)
+            message = self._queue.popleft()
             if isinstance(message, Event):
                 self.handle_event(message)
             elif isinstance(message, Command):
@@ -34,7 +35,8 @@ class MessageBus:
                 raise UnknownMessageBusMessageType(message)
 
     def handle_event(self, event: Event):
-        for handler in self.event_handlers[type(event)]:
+        # Events without in-process handlers are only published via the outbox
+        for handler in self.event_handlers.get(type(event), []):
             try:
                 self.logger.info("Handling event %s", type(event))
                 handler(event)
@@ -1,5 +1,5 @@
 import abc
-from typing import Any, Iterable, List
+from typing import Any, Iterable, List, MutableSequence
 from uuid import UUID
 
 from pydantic import BaseModel
@@ -38,8 +38,33 @@ class Command(BaseModel):
 
 
 class Entity:
+    """Base for aggregates. Raise domain events with ``raise_event``.
+
+    Events are held per instance. Instances loaded by the ORM skip
+    ``__init__``, so the list is created on first access.
+    """
+
     id: Any
-    events: List[Event] = []
+
+    @property
+    def events(self) -> List[Event]:
+        return self.__dict__.setdefault("_events", [])
+
+    def raise_event(self, event: Event) -> None:
+        events = self.events
+        events.append(event)
+        if len(events) == 1:
+            raised = self.__dict__.get("_raised")
+            if raised is not None:
+                raised.append(self)
+
+    def track_events(self, raised: MutableSequence["Entity"]) -> None:
+        """Report this entity to ``raised`` whenever it gains pending events."""
+        if self.__dict__.get("_raised") is raised:
+            return
+        self.__dict__["_raised"] = raised
+        if self.events:
+            raised.append(self)
 
     def __hash__(self):
         return hash(self.id)
@@ -1,13 +1,26 @@
-from sqlalchemy import create_engine
+import itertools
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, List, Optional
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import Engine
 from sqlalchemy.orm import scoped_session, sessionmaker
-from sqlalchemy.pool import NullPool
+from sqlalchemy.pool import QueuePool
 
+from components.shared.infrastructure.logger import logger
+from components.shared.infrastructure.os import env
 from components.shared.infrastructure.secrets_manager import secrets_manager
+from components.shared.infrastructure.tenant import get_current_tenant
 
+DEFAULT_ISOLATION_LEVEL = "REPEATABLE READ"
+# Queries only need committed rows, not a stable snapshot across statements
+READ_ONLY_ISOLATION_LEVEL = "READ COMMITTED"
 
-def get_postgres_uri(sm=secrets_manager) -> str:
-    secrets = sm.get_tenant_secrets()
-    db_secrets = secrets["database"]
+
+def _postgres_uri(db_secrets: dict) -> str:
     host = db_secrets["host"]
     user = db_secrets["user"]
     password = db_secrets["password"]
@@ -17,24 +30,236 @@ def get_postgres_uri(sm=secrets_manager) -> str:
     return f"postgresql://{user}:{password}@{host}:{port}/{db_name}"
 
 
-class TenantAwareSessionFactory(sessionmaker):
-    def __call__(self, **kwargs):
-        # Call get_postgres_uri() to get the URI for the current tenant
-        uri = get_postgres_uri()
-        engine = create_engine(
-            uri, isolation_level="REPEATABLE READ", poolclass=NullPool
+def get_postgres_uri(sm=secrets_manager) -> str:
+    return _postgres_uri(sm.get_tenant_secrets()["database"])
+
+
+def get_replica_uris(sm=secrets_manager) -> List[str]:
+    """URIs of the tenant's optional read replicas (``database.replicas``).
+
+    Each replica is a host string or an object overriding any of the
+    primary's fields, usually ``host`` and ``port``.
+    """
+    db_secrets = sm.get_tenant_secrets()["database"]
+    timeout = env.int("DB_REPLICA_CONNECT_TIMEOUT_S", 2)
+    uris = []
+    for replica in db_secrets.get("replicas") or []:
+        if isinstance(replica, str):
+            replica = {"host": replica}
+        uri = _postgres_uri({**db_secrets, **replica})
+        # An unreachable replica must fail fast, not stall the request
+        uris.append(f"{uri}?connect_timeout={timeout}")
+    return uris
+
+
+def pooled_engine_factory(uri: str) -> Engine:
+    # Sized per worker process: with gevent every greenlet shares this pool, so
+    # DB_POOL_TIMEOUT_S bounds how long a request waits for a free connection
+    # instead of opening unbounded connections against Postgres.
+    return create_engine(
+        uri,
+        isolation_level=DEFAULT_ISOLATION_LEVEL,
+        poolclass=QueuePool,
+        pool_size=env.int("DB_POOL_SIZE", 5),
+        max_overflow=env.int("DB_POOL_MAX_OVERFLOW", 10),
+        pool_timeout=env.float("DB_POOL_TIMEOUT_S", 30.0),
+        pool_recycle=env.int("DB_POOL_RECYCLE_S", 1800),
+        pool_pre_ping=env.bool("DB_POOL_PRE_PING", True),
+        pool_use_lifo=True,
+    )
+
+
+class TenantEngineRegistry:
+    """Process-wide cache of one pooled engine per tenant database.
+
+    Engines are kept in LRU order and the least recently used tenant is
+    disposed once ``max_engines`` is exceeded, so idle tenants do not hold
+    connections forever. If a tenant's URI changes (credential rotation) its
+    engine is rebuilt on the next checkout.
+    """
+
+    def __init__(
+        self,
+        engine_factory: Callable[[str], Engine] = pooled_engine_factory,
+        max_engines: Optional[int] = None,
+    ):
+        self._engine_factory = engine_factory
+        self._max_engines = max_engines or env.int("DB_MAX_TENANT_ENGINES", 32)
+        self._engines: "OrderedDict[str, tuple[str, Engine]]" = OrderedDict()
+        # threading primitives are cooperative once gevent monkey-patches them
+        self._lock = threading.RLock()
+        self._pid = os.getpid()
+
+    def get_engine(self, tenant: str, uri: str) -> Engine:
+        with self._lock:
+            self._reset_after_fork()
+            cached = self._engines.get(tenant)
+            if cached and cached[0] == uri:
+                self._engines.move_to_end(tenant)
+                return cached[1]
+
+            if cached:
+                logger.info(f"Tenant {tenant} database uri changed, rebuilding engine")
+                cached[1].dispose()
+
+            engine = self._engine_factory(uri)
+            self._engines[tenant] = (uri, engine)
+            self._engines.move_to_end(tenant)
+            self._evict()
+            return engine
+
+    def dispose(self, tenant: Optional[str] = None) -> None:
+        with self._lock:
+            tenants = [tenant] if tenant else list(self._engines)
+            for name in tenants:
+                cached = self._engines.pop(name, None)
+                if cached:
+                    cached[1].dispose()
+
+    def _evict(self) -> None:
+        while len(self._engines) > self._max_engines:
+            tenant, (_, engine) = self._engines.popitem(last=False)
+            logger.info(f"Evicting idle engine for tenant {tenant}")
+            engine.dispose()
+
+    def _reset_after_fork(self) -> None:
+        # Pooled connections must never be shared across processes (gunicorn
+        # pre-fork). Drop inherited pools without closing the parent's sockets.
+        if self._pid == os.getpid():
+            return
+        for _, engine in self._engines.values():
+            engine.dispose(close=False)
+        self._engines.clear()
+        self._pid = os.getpid()
+
+
+engine_registry = TenantEngineRegistry()
+
+
+# NULL when the replica is not streaming from the primary: a disconnected
+# receiver has replayed everything it received, yet may be arbitrarily stale.
+# Otherwise zero when the replica has replayed everything it received, so an
+# idle primary does not make a caught-up replica look stale
+REPLICA_LAG_QUERY = text(
+    "SELECT CASE"
+    " WHEN NOT EXISTS (SELECT 1 FROM pg_stat_wal_receiver WHERE status = 'streaming')"
+    " THEN NULL"
+    " WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0"
+    " ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)"
+    " END"
+)
+
+
+class ReplicaLagMonitor:
+    """Process-wide cache of each replica's replication lag.
+
+    A reading is refreshed at most every ``check_s`` seconds, by whichever
+    caller finds it stale first; concurrent callers keep using the previous
+    reading meanwhile. A replica that was never measured, failed its check or
+    lags more than ``max_lag_s`` is unavailable until the next check.
+    """
+
+    def __init__(
+        self, check_s: Optional[float] = None, max_lag_s: Optional[float] = None
+    ):
+        self._check_s = check_s or env.float("DB_REPLICA_LAG_CHECK_S", 5.0)
+        self._max_lag_s = (
+            max_lag_s
+            if max_lag_s is not None
+            else env.float("DB_REPLICA_MAX_LAG_S", 5.0)
         )
+        self._readings: dict[str, tuple[float, Optional[float]]] = {}
+        self._refreshing: set[str] = set()
+        self._lock = threading.Lock()
+
+    def available(self, key: str, engine: Engine) -> bool:
+        with self._lock:
+            checked_at, lag = self._readings.get(key, (None, None))
+            refresh = key not in self._refreshing and (
+                checked_at is None or time.monotonic() - checked_at >= self._check_s
+            )
+            if refresh:
+                self._refreshing.add(key)
+        if refresh:
+            lag = self._measure(key, engine)
+            with self._lock:
+                self._readings[key] = (time.monotonic(), lag)
+                self._refreshing.discard(key)
+        return lag is not None and lag <= self._max_lag_s
+
+    @staticmethod
+    def _measure(key: str, engine: Engine) -> Optional[float]:
+        try:
+            with engine.connect() as connection:
+                lag = connection.execute(REPLICA_LAG_QUERY).scalar()
+        except Exception as e:
+            logger.warning(f"Replica {key} lag check failed: {e}")
+            return None
+        if lag is None:
+            logger.warning(f"Replica {key} is not streaming from the primary")
+            return None
+        return float(lag)
+
+
+replica_lag_monitor = ReplicaLagMonitor()
+_replica_turn = itertools.count()
 
-        # Bind the engine to the session's configuration
-        kwargs["bind"] = engine
+
+class TenantAwareSessionFactory(sessionmaker):
+    def __init__(self, registry: TenantEngineRegistry = engine_registry, **kwargs):
+        super(TenantAwareSessionFactory, self).__init__(**kwargs)
+        self._registry = registry
+
+    def __call__(self, **kwargs):
+        kwargs["bind"] = self._engine(get_current_tenant() or "default")
         return super(TenantAwareSessionFactory, self).__call__(**kwargs)
 
+    def _engine(self, tenant: str) -> Engine:
+        # Check out the pooled engine for the current tenant's database
+        return self._registry.get_engine(tenant, get_postgres_uri())
+
+
+class ReplicaRoutingSessionFactory(TenantAwareSessionFactory):
+    """Binds sessions to one of the tenant's read replicas when possible.
+
+    Replicas are taken in turn, skipping any the lag monitor reports as
+    unavailable; with none configured or none available the session goes to
+    the primary. Only for read-only units of work: reads may trail the
+    primary by up to the lag budget.
+    """
+
+    def __init__(
+        self,
+        registry: TenantEngineRegistry = engine_registry,
+        monitor: ReplicaLagMonitor = replica_lag_monitor,
+        **kwargs,
+    ):
+        super(ReplicaRoutingSessionFactory, self).__init__(registry, **kwargs)
+        self._monitor = monitor
+
+    def _engine(self, tenant: str) -> Engine:
+        replicas = get_replica_uris()
+        start = next(_replica_turn) if replicas else 0
+        for offset in range(len(replicas)):
+            index = (start + offset) % len(replicas)
+            key = f"{tenant}#replica{index}"
+            engine = self._registry.get_engine(key, replicas[index])
+            if self._monitor.available(key, engine):
+                return engine
+        return super(ReplicaRoutingSessionFactory, self)._engine(tenant)
+
 
-def scoped_session_factory():
+def scoped_session_factory(
+    session_factory_class: type = TenantAwareSessionFactory, **session_options
+):
     def factory():
-        return scoped_session(TenantAwareSessionFactory())
+        return scoped_session(session_factory_class(**session_options))
 
     return factory
 
 
 DEFAULT_SESSION_MAKER = scoped_session_factory()
+# Writes always go to the primary; read-only units of work may use replicas
+READ_ONLY_SESSION_MAKER = scoped_session_factory(
+    ReplicaRoutingSessionFactory, autoflush=False
+)
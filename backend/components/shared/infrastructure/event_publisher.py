@@ -0,0 +1,40 @@
+import json
+import os
+from typing import List, Optional
+
+import redis
+
+from components.shared.application.event_publisher import EventPublisher
+from components.shared.infrastructure.errors import EventPublisherError
+
+
+class RedisStreamEventPublisher(EventPublisher):
+    """Publishes each topic to a Redis stream (``events:<topic>``).
+
+    Consumers read with consumer groups (XREADGROUP) and must tolerate
+    redelivery: the outbox relay publishes at least once, so deduplicate on
+    the message ``id``.
+    """
+
+    def __init__(self, url: str, max_len: Optional[int] = None):
+        self._redis = redis.Redis.from_url(url, decode_responses=True)
+        self._max_len = max_len or int(os.getenv("EVENT_STREAM_MAXLEN", "10000"))
+
+    @staticmethod
+    def _stream_key(topic: str) -> str:
+        return f"events:{topic}"
+
+    def publish(self, topic: str, messages: List[dict]) -> None:
+        key = self._stream_key(topic)
+        pipeline = self._redis.pipeline(transaction=False)
+        for message in messages:
+            pipeline.xadd(
+                key,
+                {"message": json.dumps(message)},
+                maxlen=self._max_len,
+                approximate=True,
+            )
+        try:
+            pipeline.execute()
+        except redis.RedisError as e:
+            raise EventPublisherError(f"Failed to publish to {key}: {e}")
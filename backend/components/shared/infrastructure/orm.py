@@ -0,0 +1,40 @@
+from sqlalchemy import (
+    BigInteger,
+    Column,
+    DateTime,
+    Index,
+    Integer,
+    MetaData,
+    String,
+    Table,
+    Text,
+    text,
+)
+from sqlalchemy.dialects.postgresql import UUID
+
+metadata = MetaData()
+
+
+outbox_table = Table(
+    "event_outbox",
+    metadata,
+    # Sequence gives the relay a stable publish order
+    Column(
+        "id",
+        BigInteger().with_variant(Integer, "sqlite"),
+        primary_key=True,
+        autoincrement=True,
+    ),
+    Column("event_id", UUID(as_uuid=True), nullable=False),
+    Column("event_name", String(length=255), nullable=False),
+    Column("payload", Text, nullable=False),
+    Column("created_at", DateTime, nullable=False),
+    Column("published_at", DateTime, nullable=True),
+    Column("attempts", Integer, nullable=False, default=0),
+    Column("last_error", Text, nullable=True),
+    Index(
+        "idx_event_outbox_pending",
+        "id",
+        postgresql_where=text("published_at IS NULL"),
+    ),
+)
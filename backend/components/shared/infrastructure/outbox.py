@@ -0,0 +1,187 @@
+import json
+import threading
+import time
+import uuid
+from datetime import UTC, datetime, timedelta
+from typing import Callable, Dict, Iterable, List, Optional
+
+from sqlalchemy import delete, insert, select, update
+from sqlalchemy.orm import Session
+
+from components.shared.application.event_publisher import EventPublisher
+from components.shared.domain.base import Event
+from components.shared.infrastructure.db import DEFAULT_SESSION_MAKER
+from components.shared.infrastructure.errors import (
+    EventPublisherError,
+    NoTopicFoundForGivenEvent,
+)
+from components.shared.infrastructure.logger import logger
+from components.shared.infrastructure.orm import outbox_table
+from components.shared.infrastructure.os import env
+from components.shared.infrastructure.tenant import set_current_tenant
+
+PURGE_INTERVAL_S = 300
+
+
+def write_outbox(session: Session, events: Iterable[Event]) -> None:
+    """Stage events in the session's transaction; they commit with it."""
+    now = datetime.now(UTC)
+    rows = [
+        dict(
+            event_id=uuid.uuid4(),
+            event_name=event.get_event_name(),
+            payload=json.dumps(event.get_event_body(), default=str),
+            created_at=now,
+            attempts=0,
+        )
+        for event in events
+    ]
+    if rows:
+        session.execute(insert(outbox_table), rows)
+
+
+class OutboxRelay:
+    """Publishes committed outbox rows to the event broker in batches.
+
+    Rows are claimed with ``FOR UPDATE SKIP LOCKED`` so several relays can
+    run against one database. Delivery is at least once: a crash between
+    publishing and marking the batch republishes it. A row that keeps
+    failing (broker errors, no topic for its event) is retried up to
+    ``max_attempts`` times and then left in the table for inspection.
+    """
+
+    def __init__(
+        self,
+        publisher: EventPublisher,
+        topics: Dict[str, str],
+        session_factory: Callable[[], Session] = DEFAULT_SESSION_MAKER,
+        batch_size: Optional[int] = None,
+        max_attempts: Optional[int] = None,
+        retention_s: Optional[float] = None,
+    ):
+        self._publisher = publisher
+        self._topics = topics
+        self._session_factory = session_factory
+        self._batch_size = batch_size or env.int("OUTBOX_BATCH_SIZE", 100)
+        self._max_attempts = max_attempts or env.int("OUTBOX_MAX_ATTEMPTS", 10)
+        self._retention_s = retention_s or env.float("OUTBOX_RETENTION_S", 86400.0)
+        self._last_purge: Dict[str, float] = {}
+
+    def relay_batch(self) -> int:
+        """Publish one batch for the current tenant; return rows claimed."""
+        session = self._session_factory()
+        try:
+            rows = session.execute(
+                select(outbox_table)
+                .where(
+                    outbox_table.c.published_at.is_(None),
+                    outbox_table.c.attempts < self._max_attempts,
+                )
+                .order_by(outbox_table.c.id)
+                .limit(self._batch_size)
+                .with_for_update(skip_locked=True)
+            ).all()
+            if not rows:
+                session.rollback()
+                return 0
+
+            published, failed = self._publish(rows)
+            if published:
+                session.execute(
+                    update(outbox_table)
+                    .where(outbox_table.c.id.in_(published))
+                    .values(published_at=datetime.now(UTC))
+                )
+            for row_id, error in failed.items():
+                session.execute(
+                    update(outbox_table)
+                    .where(outbox_table.c.id == row_id)
+                    .values(attempts=outbox_table.c.attempts + 1, last_error=error)
+                )
+            session.commit()
+            if failed:
+                logger.warning(
+                    f"Outbox relay: {len(published)} published, {len(failed)} failed"
+                )
+            return len(rows)
+        except Exception:
+            session.rollback()
+            raise
+        finally:
+            session.close()
+
+    def purge(self) -> int:
+        """Delete published rows older than the retention window."""
+        cutoff = datetime.now(UTC) - timedelta(seconds=self._retention_s)
+        session = self._session_factory()
+        try:
+            result = session.execute(
+                delete(outbox_table).where(outbox_table.c.published_at < cutoff)
+            )
+            session.commit()
+            return result.rowcount
+        except Exception:
+            session.rollback()
+            raise
+        finally:
+            session.close()
+
+    def run(
+        self,
+        tenants: List[str],
+        stop: threading.Event,
+        poll_s: Optional[float] = None,
+    ) -> None:
+        poll_s = poll_s or env.float("OUTBOX_POLL_S", 1.0)
+        while not stop.is_set():
+            backlog = False
+            for tenant in tenants:
+                set_current_tenant(tenant)
+                try:
+                    backlog |= self.relay_batch() >= self._batch_size
+                    self._maybe_purge(tenant)
+                except Exception:
+                    logger.exception(f"Outbox relay failed for tenant {tenant}")
+            if not backlog:
+                stop.wait(poll_s)
+
+    def _publish(self, rows) -> tuple[List[int], Dict[int, str]]:
+        by_topic: Dict[str, list] = {}
+        failed: Dict[int, str] = {}
+        for row in rows:
+            topic = self._topics.get(row.event_name)
+            if topic is None:
+                failed[row.id] = str(NoTopicFoundForGivenEvent(row.event_name))
+                continue
+            by_topic.setdefault(topic, []).append(row)
+
+        published: List[int] = []
+        for topic, topic_rows in by_topic.items():
+            try:
+                self._publisher.publish(
+                    topic, [self._message(row) for row in topic_rows]
+                )
+            except EventPublisherError as e:
+                failed.update((row.id, str(e)) for row in topic_rows)
+                continue
+            published.extend(row.id for row in topic_rows)
+        return published, failed
+
+    @staticmethod
+    def _message(row) -> dict:
+        return {
+            "id": str(row.event_id),
+            "name": row.event_name,
+            "body": json.loads(row.payload),
+            "created_at": row.created_at.isoformat(),
+        }
+
+    def _maybe_purge(self, tenant: str) -> None:
+        now = time.monotonic()
+        last = self._last_purge.get(tenant)
+        if last is not None and now - last < PURGE_INTERVAL_S:
+            return
+        self._last_purge[tenant] = now
+        purged = self.purge()
+        if purged:
+            logger.info(f"Outbox relay purged {purged} rows for tenant {tenant}")
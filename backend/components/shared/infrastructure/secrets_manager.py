@@ -1,4 +1,9 @@
+import copy
 import json
+import os
+import re
+import threading
+import time
 from typing import Optional
 
 from environs import EnvError
@@ -9,28 +14,98 @@ from components.shared.infrastructure.logger import logger
 from components.shared.infrastructure.os import env
 from components.shared.infrastructure.tenant import TenantResolver
 
+# The tenant comes from a request header and names a file, so it must not be
+# able to contain path separators
+_TENANT_KEY = re.compile(r"^[A-Za-z0-9_-]+$")
+
 
 class SecretsManager(SecretManagerInterface):
+    """Tenant secrets read from the environment or from ``<secrets_dir>/<TENANT>.json``.
+
+    Parsed secrets are cached per tenant for ``ttl_s`` seconds. File-backed
+    secrets are also re-read as soon as the file's mtime changes, so rotating
+    a secret file does not require restarting workers.
+    """
+
     def __init__(
         self,
         tenant_resolver: Optional[TenantResolver] = None,
+        ttl_s: Optional[float] = None,
+        secrets_dir: Optional[str] = None,
     ):
         self._tenant_resolver = tenant_resolver if tenant_resolver else TenantResolver()
+        self._ttl_s = (
+            ttl_s if ttl_s is not None else env.float("SECRETS_CACHE_TTL_S", 300.0)
+        )
+        self._secrets_dir = secrets_dir or env.str("TENANT_SECRETS_DIR", "") or None
+        self._cache: dict[str, tuple[float, Optional[float], dict]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _tenant_key(tenant) -> str:
+        key = (tenant or "").replace(".", "").upper()
+        if not _TENANT_KEY.match(key):
+            raise errors.NoConfigForTenant(tenant_name=tenant)
+        return key
+
+    def _secrets_file(self, tenant) -> Optional[str]:
+        if not self._secrets_dir:
+            return None
+        path = os.path.join(self._secrets_dir, f"{self._tenant_key(tenant)}.json")
+        return path if os.path.isfile(path) else None
 
-    def _load_tenant_secrets(self, tenant):
+    @staticmethod
+    def _mtime(path: Optional[str]) -> Optional[float]:
+        if not path:
+            return None
         try:
-            tenant_env_var = tenant.replace(".", "").upper()
+            return os.stat(path).st_mtime
+        except OSError:
+            return None
+
+    def _load_tenant_secrets(self, tenant, path: Optional[str] = None):
+        try:
+            if path:
+                with open(path) as secrets_file:
+                    return json.load(secrets_file)
+            tenant_env_var = self._tenant_key(tenant)
             secret_env_var = env(tenant_env_var)
             return json.loads(secret_env_var)
-        except EnvError as err:
+        except (EnvError, OSError) as err:
             logger.exception(
                 f"Hiding secret manager error: {err}", exc_info=err.__traceback__
             )
             raise errors.NoConfigForTenant(tenant_name=tenant)
 
     def get_tenant_secrets(self) -> dict:
+        """A copy of the current tenant's secrets; callers may modify it."""
         tenant = self._tenant_resolver.get_current_tenant()
-        return self._load_tenant_secrets(tenant=tenant)
+        path = self._secrets_file(tenant)
+        mtime = self._mtime(path)
+        now = time.monotonic()
+
+        cached = self._cache.get(tenant)
+        if cached and cached[0] > now and cached[1] == mtime:
+            self.hits += 1
+            return copy.deepcopy(cached[2])
+
+        self.misses += 1
+        secrets = self._load_tenant_secrets(tenant=tenant, path=path)
+        with self._lock:
+            self._cache[tenant] = (now + self._ttl_s, mtime, secrets)
+        return copy.deepcopy(secrets)
+
+    def invalidate(self, tenant: Optional[str] = None) -> None:
+        with self._lock:
+            if tenant is None:
+                self._cache.clear()
+            else:
+                self._cache.pop(tenant, None)
+
+    def cache_stats(self) -> dict:
+        return {"hits": self.hits, "misses": self.misses, "size": len(self._cache)}
 
     def get_shared_secret(self, secret_key, default: any = None) -> any:
         try:
@@ -1,46 +1,65 @@
 from abc import ABC
+from collections import deque
 from types import SimpleNamespace
-from typing import Any, Callable, List, Set, Type, Union
+from typing import Any, Callable, Deque, Dict, List, Optional, Set, Type, Union
 
 from sqlalchemy.orm import Session
 
 from components.shared.application.base import UnitOfWorkInterface
+from components.shared.application.errors import ReadOnlyUnitOfWorkCommit
 from components.shared.domain.base import (
     Command,
     Event,
     LoggerInterface,
     RepositoryInterface,
 )
-from components.shared.infrastructure.db import DEFAULT_SESSION_MAKER
+from components.shared.infrastructure.db import (
+    DEFAULT_SESSION_MAKER,
+    READ_ONLY_ISOLATION_LEVEL,
+    READ_ONLY_SESSION_MAKER,
+)
 from components.shared.infrastructure.logger import logger
+from components.shared.infrastructure.os import env
+from components.shared.infrastructure.outbox import write_outbox
 
 
 class SQLAlchemyAbstractRepository(RepositoryInterface, ABC):
     model: Any = None
+    # Read-only units of work turn this off: nothing loaded there raises events
+    tracked: bool = True
     seen: Set[Any]
+    # Seen entities with pending events, in the order they raised them
+    raised: Deque[Any]
 
     def __init__(self, session: Session):
         self.session = session
         self._scopes: List[Callable] = []
         self.seen = set()
+        self.raised = deque()
 
     def get_all(self):
         return self.session.query(self.model).all()
 
     def save(self, model) -> None:
         self._save(model)
-        self.seen.add(model)
+        self._track(model)
 
     def get(self, id_):
         r = self._get(id_)
         if r:
-            self.seen.add(r)
+            self._track(r)
         return r
 
     def delete(self, model: Any):
         self.session.delete(model)
         self.session.flush()
 
+    def _track(self, model) -> None:
+        if not self.tracked:
+            return
+        self.seen.add(model)
+        model.track_events(self.raised)
+
     def _save(self, model):
         self.session.add(model)
         self.session.flush()
@@ -51,7 +70,8 @@ class SQLAlchemyAbstractRepository(RepositoryInterface, ABC):
     def get_many_by_ids(self, ids: List) -> List[Type[model]]:
         results = self.session.query(self.model).filter(self.model.id.in_(ids)).all()
 
-        [self.seen.add(r) for r in results]
+        for r in results:
+            self._track(r)
 
         return results
 
@@ -63,10 +83,12 @@ class SqlAlchemyUnitOfWork(UnitOfWorkInterface):
         self,
         session_factory: Callable[[], Session] = DEFAULT_SESSION_MAKER,
         logger: LoggerInterface = logger,  # @todo remove
+        outbox: Optional[bool] = None,
         **kwargs: Type[SQLAlchemyAbstractRepository],
     ):
         self._session_factory = session_factory
         self.logger = logger
+        self._outbox = env.bool("OUTBOX_ENABLED", True) if outbox is None else outbox
         self._repository_config = kwargs
 
     def __enter__(self) -> UnitOfWorkInterface:
@@ -76,6 +98,8 @@ class SqlAlchemyUnitOfWork(UnitOfWorkInterface):
             for name, repository in self._repository_config.items()
         }
         self.repositories = SimpleNamespace(**repositories)
+        # Events already staged in the outbox, kept alive so ids stay unique
+        self._outboxed: Dict[int, Event] = {}
         return super().__enter__()
 
     def __exit__(self, *args):
@@ -83,15 +107,66 @@ class SqlAlchemyUnitOfWork(UnitOfWorkInterface):
         self.session.close()
 
     def commit(self):
+        if self._outbox:
+            self._stage_events()
         self.session.commit()
 
     def rollback(self):
         self.session.rollback()
 
+    def _stage_events(self) -> None:
+        # Pending events are written in the committing transaction and stay
+        # pending for the bus; a later commit in this unit of work skips them
+        staged = [
+            event
+            for repository in self.repositories.__dict__.values()
+            for model in repository.raised
+            for event in model.events
+            if id(event) not in self._outboxed
+        ]
+        if staged:
+            write_outbox(self.session, staged)
+            self._outboxed.update((id(event), event) for event in staged)
+
+    def collect_new_events(self) -> List[Union[Event, Command]]:
+        for repository in self.repositories.__dict__.values():
+            raised = repository.raised
+            while raised:
+                events = raised.popleft().events
+                yield from events
+                events.clear()
+
+
+class SqlAlchemyReadOnlyUnitOfWork(SqlAlchemyUnitOfWork):
+    """Unit of work for queries.
+
+    Runs a READ COMMITTED, ``READ ONLY`` transaction on a session that never
+    autoflushes. Repositories do not track loaded entities, no events are
+    collected or written to the outbox and ``commit`` is refused.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session] = READ_ONLY_SESSION_MAKER,
+        logger: LoggerInterface = logger,
+        **kwargs: Type[SQLAlchemyAbstractRepository],
+    ):
+        super().__init__(session_factory, logger, outbox=False, **kwargs)
+
+    def __enter__(self) -> UnitOfWorkInterface:
+        uow = super().__enter__()
+        for repository in self.repositories.__dict__.values():
+            repository.tracked = False
+        # Both only apply to PostgreSQL (local in-memory databases skip them)
+        if self.session.get_bind().dialect.name == "postgresql":
+            connection = self.session.connection(
+                execution_options={"isolation_level": READ_ONLY_ISOLATION_LEVEL}
+            )
+            connection.exec_driver_sql("SET TRANSACTION READ ONLY")
+        return uow
+
+    def commit(self):
+        raise ReadOnlyUnitOfWorkCommit()
+
     def collect_new_events(self) -> List[Union[Event, Command]]:
-        repositories = self.repositories.__dict__
-        for repository_name in repositories:
-            repository = repositories[repository_name]
-            for model in repository.seen:
-                while model.events:
-                    yield model.events.pop(0)
+        return []
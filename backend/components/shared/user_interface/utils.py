@@ -1,5 +1,7 @@
 import json
+import zlib
 from functools import wraps
+from typing import Iterable, Iterator
 
 from flask import request
 
@@ -22,3 +24,13 @@ def parse_with_for_http(schema, **kwargs):
         return inner
 
     return decorator
+
+
+def gzip_stream(chunks: Iterable[str], level: int = 6) -> Iterator[bytes]:
+    """Incrementally gzip a text stream without buffering the whole body."""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+    for chunk in chunks:
+        data = compressor.compress(chunk.encode("utf-8"))
+        if data:
+            yield data
+    yield compressor.flush()
@@ -0,0 +1,147 @@
+import asyncio
+import time
+from typing import AsyncIterator, Awaitable, Callable, Optional
+
+from components.shared.infrastructure.errors import NoConfigForTenant
+from components.shared.infrastructure.tenant import get_current_tenant
+from components.summary.application import resilience
+from components.summary.application.prompts import build_summary_prompt
+from components.summary.application.providers import (
+    BACKEND_MOCK,
+    CodeFenceStripper,
+    GeminiProvider,
+    ProviderRegistry,
+    _resolve_api_key,
+    _resolve_preprocessing,
+    _resolve_routes,
+)
+
+
+class AsyncSummaryProvider:
+    """Asyncio counterpart of SummaryProvider for the ASGI streaming path."""
+
+    model_name: Optional[str] = None
+    poolable: bool = True
+
+    def stream_summary(self, content_html: str, options: dict) -> AsyncIterator[str]:
+        raise NotImplementedError
+
+
+class AsyncMockProvider(AsyncSummaryProvider):
+    model_name = "mock"
+
+    async def stream_summary(
+        self, content_html: str, options: dict
+    ) -> AsyncIterator[str]:
+        text = options.get(
+            "mock_text",
+            (content_html or "").strip()[:400] or "No content provided to summarize.",
+        )
+        for chunk in [text[:200], text[200:350], text[350:]]:
+            await asyncio.sleep(0.15)
+            if chunk:
+                yield chunk
+
+
+class AsyncGeminiProvider(GeminiProvider, AsyncSummaryProvider):
+    """Gemini over the SDKs' asyncio clients.
+
+    Client setup, retry policy and circuit breakers are shared with
+    GeminiProvider; only the waiting is done with ``await``.
+    """
+
+    async def _astream_with_retries(
+        self,
+        open_stream: Callable[[], Awaitable],
+        log_prefix: str,
+        fail_message: str,
+    ) -> AsyncIterator[str]:
+        breaker = resilience.circuit_breakers.get(self.provider_name, self._model_name)
+        deadline = time.monotonic() + self._max_retry_wait
+        last_err: Optional[Exception] = None
+        for attempt in range(self._attempts):
+            self._check_circuit(breaker, log_prefix)
+            emitted = False
+            fences = CodeFenceStripper()
+            try:
+                async for chunk in await open_stream():
+                    text = fences.feed(getattr(chunk, "text", None) or "")
+                    if text:
+                        if not emitted:
+                            breaker.record_success()
+                        emitted = True
+                        yield text
+                tail = fences.flush()
+                if tail:
+                    yield tail
+                breaker.record_success()
+                return
+            except Exception as e:
+                last_err = e
+                delay = self._retry_delay(
+                    e, attempt, emitted, deadline, breaker, log_prefix
+                )
+                if delay is None:
+                    break
+                await asyncio.sleep(delay)
+        raise self._retries_exhausted(last_err, log_prefix, fail_message)
+
+    def _arequest_new_client(self, prompt: str) -> Awaitable:
+        config = self._build_new_config()
+        if config is not None:
+            return self._client.aio.models.generate_content_stream(
+                model=self._model_name, contents=prompt, config=config
+            )
+        return self._client.aio.models.generate_content_stream(
+            model=self._model_name, contents=prompt
+        )
+
+    async def stream_summary(
+        self, content_html: str, options: dict
+    ) -> AsyncIterator[str]:
+        prompt = build_summary_prompt(content_html, options.get("instruction"))
+        if self._use_new:
+            stream = self._astream_with_retries(
+                lambda: self._arequest_new_client(prompt),
+                log_prefix="genai_client",
+                fail_message="LLM request failed",
+            )
+        else:
+            stream = self._astream_with_retries(
+                lambda: self._model.generate_content_async(prompt, stream=True),
+                log_prefix="gemini_stream",
+                fail_message="LLM stream failed",
+            )
+        async for text in stream:
+            yield text
+
+
+async_provider_registry = ProviderRegistry(provider_factory=AsyncGeminiProvider)
+async_provider_registry.register(
+    BACKEND_MOCK, lambda api_key, model: AsyncMockProvider()
+)
+
+
+def get_async_provider() -> Optional[AsyncSummaryProvider]:
+    """Async provider for the current tenant, or None when its configuration
+    needs features only the synchronous pipeline has (multiple routes,
+    compact preprocessing, backends without an asyncio client, the legacy
+    SDK whose process-global API key cannot be held across an await)."""
+    if _resolve_preprocessing() == "compact":
+        return None
+    routes = _resolve_routes()
+    if len(routes) != 1 or not async_provider_registry.has_backend(routes[0][0]):
+        return None
+
+    api_key = _resolve_api_key()
+    tenant = get_current_tenant() or "unknown"
+    if not api_key:
+        raise NoConfigForTenant(tenant)
+    backend, model = routes[0]
+    provider = async_provider_registry.get(tenant, api_key, model, backend=backend)
+    if not provider.poolable:
+        return None
+
+    from components.summary.application.limiter import AsyncLimitedProvider
+
+    return AsyncLimitedProvider(provider)
@@ -0,0 +1,132 @@
+import asyncio
+import threading
+from typing import Any, AsyncIterator, Callable, Iterable, Optional
+
+from components.shared.application.base import UnitOfWorkInterface
+from components.shared.domain.base import LoggerInterface
+from components.shared.infrastructure.tenant import set_current_tenant
+from components.summary.application import hierarchical
+from components.summary.application.async_providers import get_async_provider
+from components.summary.application.single_flight import async_summary_flights
+from components.summary.application.summary_cache import (
+    replay_summary,
+    summary_cache,
+    summary_cache_key,
+)
+from components.summary.application.summary_service import SummaryService
+
+_ITEM, _DONE, _ERROR = range(3)
+
+
+def _call_for_tenant(tenant: Optional[str], fn: Callable, *args) -> Any:
+    # Tenant is a thread-local; worker threads are reused across tenants
+    set_current_tenant(tenant)
+    return fn(*args)
+
+
+async def run_blocking(tenant: Optional[str], fn: Callable, *args) -> Any:
+    """Run a blocking call (database, secrets, cache) off the event loop."""
+    return await asyncio.to_thread(_call_for_tenant, tenant, fn, *args)
+
+
+async def iterate_blocking(
+    tenant: Optional[str], start: Callable[[], Iterable]
+) -> AsyncIterator:
+    """Drive a blocking iterator on its own thread and relay its items."""
+    loop = asyncio.get_running_loop()
+    items: asyncio.Queue = asyncio.Queue()
+    stop = threading.Event()
+
+    def put(kind: int, payload=None):
+        try:
+            loop.call_soon_threadsafe(items.put_nowait, (kind, payload))
+        except RuntimeError:
+            # Event loop already closed (worker shutting down)
+            stop.set()
+
+    def pump():
+        set_current_tenant(tenant)
+        try:
+            for item in start():
+                if stop.is_set():
+                    return
+                put(_ITEM, item)
+        except Exception as e:
+            put(_ERROR, e)
+        else:
+            put(_DONE)
+
+    threading.Thread(target=pump, daemon=True).start()
+    try:
+        while True:
+            kind, payload = await items.get()
+            if kind == _DONE:
+                return
+            if kind == _ERROR:
+                raise payload
+            yield payload
+    finally:
+        stop.set()
+
+
+async def generate_stream_async(
+    document_id,
+    options: Optional[dict],
+    uow: UnitOfWorkInterface,
+    logger: LoggerInterface,
+    tenant: Optional[str],
+    annotate: Optional[Callable[..., None]] = None,
+) -> AsyncIterator:
+    """Asyncio equivalent of SummaryService.generate_stream.
+
+    Single-model generation awaits the provider directly, so an open stream
+    costs no thread. Hierarchical generation and tenants whose configuration
+    needs the synchronous provider stack (routes, compact preprocessing) run
+    the regular pipeline on a worker thread instead.
+    """
+    content, options = await run_blocking(
+        tenant, SummaryService.prepare_generation, document_id, options, uow, logger
+    )
+    if annotate:
+        annotate(source_hash=options["source_hash"])
+    provider = await run_blocking(tenant, get_async_provider)
+    if provider is None or hierarchical.use_hierarchical(content, options):
+        stream = iterate_blocking(
+            tenant,
+            lambda: SummaryService.stream_content(
+                document_id, content, options, logger
+            ),
+        )
+        async for chunk in stream:
+            yield chunk
+        return
+
+    cache_key = summary_cache_key(
+        tenant,
+        content,
+        options.get("instruction"),
+        provider.model_name,
+        hierarchical.MODE_SINGLE,
+    )
+    if options.get("use_cache", True):
+        cached = await run_blocking(tenant, summary_cache.get, cache_key)
+        if cached is not None:
+            logger.info(f"Summary cache hit for document {document_id}")
+            for chunk in replay_summary(cached):
+                yield chunk
+            return
+
+    async def start():
+        chunks = []
+        async for chunk in provider.stream_summary(content, options):
+            if isinstance(chunk, str):
+                chunks.append(chunk)
+            yield chunk
+        summary_html = "".join(chunks)
+        if summary_html:
+            await run_blocking(
+                tenant, summary_cache.set, cache_key, summary_html, provider.model_name
+            )
+
+    async for chunk in async_summary_flights.stream(cache_key, start):
+        yield chunk
@@ -0,0 +1,6 @@
+from components.shared.domain.errors import EntityNotFound
+
+
+class SummaryJobNotFound(EntityNotFound):
+    def __init__(self, job_id: str):
+        self.message = f"Summary job with id {job_id} not found"
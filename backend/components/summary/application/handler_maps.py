@@ -8,3 +8,5 @@ COMMAND_HANDLER_MAPS = {
 }
 
 EVENT_HANDLER_MAPS = {}
+
+EVENT_TOPIC_MAPS = {}
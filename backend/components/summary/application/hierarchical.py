@@ -0,0 +1,156 @@
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable, Optional
+
+from components.shared.infrastructure.tenant import set_current_tenant
+from components.summary.application.prompts import (
+    REDUCE_SUMMARY_INSTRUCTION,
+    SECTION_SUMMARY_INSTRUCTION,
+)
+from components.summary.application.providers import SummaryProvider
+from components.summary.application.summary_cache import (
+    SummaryCache,
+    summary_cache,
+    summary_cache_key,
+)
+
+MODE_HIERARCHICAL = "hierarchical"
+MODE_SINGLE = "single"
+
+_HEADING_START = re.compile(r"(?=<h[1-3][\s>])", re.IGNORECASE)
+_BLOCK_END = re.compile(
+    r"(?<=</p>)|(?<=</ul>)|(?<=</ol>)|(?<=</table>)|(?<=</div>)|(?<=</blockquote>)",
+    re.IGNORECASE,
+)
+
+
+def _int_env(name: str, default: int) -> int:
+    try:
+        return int(os.getenv(name, str(default)))
+    except ValueError:
+        return default
+
+
+def use_hierarchical(content_html: str, options: dict) -> bool:
+    mode = options.get("mode")
+    if mode in (MODE_HIERARCHICAL, MODE_SINGLE):
+        return mode == MODE_HIERARCHICAL
+    threshold = _int_env("SUMMARY_HIERARCHICAL_THRESHOLD_CHARS", 30000)
+    return len(content_html or "") > threshold
+
+
+def split_sections(
+    content_html: str, max_chars: Optional[int] = None, min_chars: Optional[int] = None
+) -> list[str]:
+    """Split HTML at h1-h3 headings, then at block ends for oversized sections.
+
+    Consecutive small sections are grouped until they reach ``min_chars`` so a
+    contract made of many short clauses does not turn into dozens of calls.
+    """
+    max_chars = max_chars or _int_env("SUMMARY_SECTION_MAX_CHARS", 12000)
+    min_chars = min_chars or _int_env("SUMMARY_SECTION_MIN_CHARS", 2000)
+
+    pieces = []
+    for part in _HEADING_START.split(content_html or ""):
+        if len(part) <= max_chars:
+            pieces.append(part)
+            continue
+        current = ""
+        for block in _BLOCK_END.split(part):
+            if current and len(current) + len(block) > max_chars:
+                pieces.append(current)
+                current = ""
+            current += block
+        pieces.append(current)
+
+    sections, current = [], ""
+    for piece in pieces:
+        if not piece.strip():
+            continue
+        current += piece
+        if len(current) >= min_chars:
+            sections.append(current)
+            current = ""
+    if current:
+        if sections and len(sections[-1]) + len(current) <= max_chars:
+            sections[-1] += current
+        else:
+            sections.append(current)
+    return sections
+
+
+def _group(partials: list[str], max_chars: int) -> list[str]:
+    groups, current = [], ""
+    for partial in partials:
+        section = f"<section>{partial}</section>"
+        if current and len(current) + len(section) > max_chars:
+            groups.append(current)
+            current = ""
+        current += section
+    if current:
+        groups.append(current)
+    return groups
+
+
+def stream_hierarchical_summary(
+    provider: SummaryProvider,
+    content_html: str,
+    options: dict,
+    tenant: Optional[str],
+    cache: SummaryCache = summary_cache,
+) -> Iterable[str]:
+    """Map-reduce summary: sections in parallel, then a streamed reduce pass.
+
+    Section summaries are cached by content hash, so editing one section only
+    re-summarizes that section before the reduce pass runs again.
+    """
+    max_chars = _int_env("SUMMARY_SECTION_MAX_CHARS", 12000)
+    concurrency = max(1, _int_env("SUMMARY_MAP_CONCURRENCY", 4))
+
+    def summarize_section(section_html: str) -> str:
+        # Pool threads do not inherit the request's tenant
+        set_current_tenant(tenant)
+        key = summary_cache_key(
+            tenant, section_html, SECTION_SUMMARY_INSTRUCTION, provider.model_name
+        )
+        cached = cache.get(key)
+        if cached is not None:
+            return cached
+        summary_html = "".join(
+            chunk
+            for chunk in provider.stream_summary(
+                section_html, {"instruction": SECTION_SUMMARY_INSTRUCTION}
+            )
+            if isinstance(chunk, str)
+        )
+        cache.set(key, summary_html, provider.model_name)
+        return summary_html
+
+    sections = split_sections(content_html, max_chars=max_chars)
+    if len(sections) <= 1:
+        yield from provider.stream_summary(content_html, options)
+        return
+
+    with ThreadPoolExecutor(max_workers=min(concurrency, len(sections))) as pool:
+        partials = list(pool.map(summarize_section, sections))
+        # Keep reducing until the combined section summaries fit one prompt
+        while len(partials) > 1 and sum(map(len, partials)) > max_chars:
+            groups = _group(partials, max_chars)
+            if len(groups) == len(partials):
+                break
+            partials = list(pool.map(summarize_section, groups))
+
+    # The reduce framing is always needed: the input is section summaries, not
+    # the document. A caller's instruction still shapes the final summary
+    instruction = options.get("instruction")
+    reduce_options = dict(options)
+    reduce_options["instruction"] = (
+        f"{REDUCE_SUMMARY_INSTRUCTION}\n{instruction}"
+        if instruction
+        else REDUCE_SUMMARY_INSTRUCTION
+    )
+    yield from provider.stream_summary(
+        "".join(f"<section>{partial}</section>" for partial in partials),
+        reduce_options,
+    )
@@ -0,0 +1,78 @@
+import difflib
+import os
+import re
+from typing import Optional
+
+from components.summary.application.summary_cache import content_hash, normalize_html
+
+MODE_INCREMENTAL = "incremental"
+
+_BLOCK_START = re.compile(
+    r"(?=<(?:h[1-6]|p|ul|ol|table|blockquote|pre|div)[\s>])", re.IGNORECASE
+)
+
+
+def split_blocks(content_html: str) -> list[str]:
+    return [block for block in _BLOCK_START.split(content_html or "") if block.strip()]
+
+
+def diff_blocks(old_html: str, new_html: str) -> tuple[list[tuple], float]:
+    """Block-level diff between two versions of a document.
+
+    Returns the non-equal opcodes as (tag, old_blocks, new_blocks) plus the
+    share of blocks touched, relative to the larger version.
+    """
+    old_blocks, new_blocks = split_blocks(old_html), split_blocks(new_html)
+    matcher = difflib.SequenceMatcher(
+        a=[normalize_html(block) for block in old_blocks],
+        b=[normalize_html(block) for block in new_blocks],
+        autojunk=False,
+    )
+    changes, touched = [], 0
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == "equal":
+            continue
+        changes.append((tag, old_blocks[i1:i2], new_blocks[j1:j2]))
+        touched += max(i2 - i1, j2 - j1)
+    ratio = touched / max(len(old_blocks), len(new_blocks), 1)
+    return changes, ratio
+
+
+def build_revision_content(summary_html: str, changes: list[tuple]) -> str:
+    parts = [f"<existing-summary>{summary_html}</existing-summary>"]
+    for tag, old_blocks, new_blocks in changes:
+        before, after = "".join(old_blocks), "".join(new_blocks)
+        if tag == "delete":
+            parts.append(f"<removed>{before}</removed>")
+        elif tag == "insert":
+            parts.append(f"<added>{after}</added>")
+        else:
+            parts.append(
+                f"<changed><before>{before}</before><after>{after}</after></changed>"
+            )
+    return "\n".join(parts)
+
+
+def plan_revision(document, options: dict) -> Optional[str]:
+    """Revision prompt content when the stored summary can be updated in place.
+
+    Requires a summary generated from a known, now outdated, version of the
+    document. Unless ``mode`` is ``incremental``, only small edits qualify
+    (SUMMARY_INCREMENTAL_MAX_CHANGE share of blocks); larger ones regenerate.
+    """
+    mode = options.get("mode")
+    if mode not in (None, MODE_INCREMENTAL) or options.get("instruction"):
+        return None
+    if not document.summary_html or not document.summary_source_html:
+        return None
+    if document.summary_content_hash == content_hash(document.content_html):
+        return None
+
+    changes, ratio = diff_blocks(document.summary_source_html, document.content_html)
+    try:
+        max_change = float(os.getenv("SUMMARY_INCREMENTAL_MAX_CHANGE", "0.3"))
+    except ValueError:
+        max_change = 0.3
+    if not changes or (mode != MODE_INCREMENTAL and ratio > max_change):
+        return None
+    return build_revision_content(document.summary_html, changes)
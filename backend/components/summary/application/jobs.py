@@ -0,0 +1,110 @@
+import abc
+import os
+import threading
+import time
+import uuid
+from typing import Optional
+
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_DONE = "done"
+JOB_ERROR = "error"
+
+FINISHED_STATUSES = (JOB_DONE, JOB_ERROR)
+
+
+def new_summary_job(tenant: Optional[str], document_id, options: dict) -> dict:
+    return {
+        "job_id": str(uuid.uuid4()),
+        "tenant": tenant,
+        "document_id": str(document_id),
+        "options": options,
+        "status": JOB_QUEUED,
+        "error": None,
+        "error_type": None,
+        "created_at": time.time(),
+    }
+
+
+class SummaryJobStore(abc.ABC):
+    """Job status plus the buffer of generated chunks, shared by web and workers."""
+
+    @abc.abstractmethod
+    def create(self, job: dict) -> None:
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def get(self, job_id: str) -> Optional[dict]:
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def update(self, job_id: str, **fields) -> None:
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def append_chunk(self, job_id: str, text: str) -> None:
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def read_chunks(self, job_id: str, start: int = 0) -> list[str]:
+        raise NotImplementedError
+
+
+class InMemorySummaryJobStore(SummaryJobStore):
+    """Single-process store, only suitable when jobs run on in-process threads."""
+
+    def __init__(self, ttl_s: Optional[float] = None):
+        self._ttl_s = ttl_s or float(os.getenv("SUMMARY_JOB_TTL_S", "3600"))
+        self._jobs: dict[str, dict] = {}
+        self._chunks: dict[str, list[str]] = {}
+        self._lock = threading.Lock()
+
+    def create(self, job: dict) -> None:
+        with self._lock:
+            self._expire()
+            self._jobs[job["job_id"]] = dict(job)
+            self._chunks[job["job_id"]] = []
+
+    def get(self, job_id: str) -> Optional[dict]:
+        job = self._jobs.get(job_id)
+        return dict(job) if job else None
+
+    def update(self, job_id: str, **fields) -> None:
+        with self._lock:
+            if job_id in self._jobs:
+                self._jobs[job_id].update(fields)
+
+    def append_chunk(self, job_id: str, text: str) -> None:
+        with self._lock:
+            self._chunks.setdefault(job_id, []).append(text)
+
+    def read_chunks(self, job_id: str, start: int = 0) -> list[str]:
+        return list(self._chunks.get(job_id, [])[start:])
+
+    def _expire(self) -> None:
+        cutoff = time.time() - self._ttl_s
+        for job_id in [
+            k for k, job in self._jobs.items() if job["created_at"] < cutoff
+        ]:
+            self._jobs.pop(job_id, None)
+            self._chunks.pop(job_id, None)
+
+
+def build_summary_job_store(ttl_s: Optional[float] = None) -> SummaryJobStore:
+    redis_url = os.getenv("SUMMARY_JOBS_REDIS_URL") or os.getenv("CELERY_BROKER_URL")
+    if redis_url and redis_url.startswith("redis"):
+        from components.summary.infrastructure.job_store import RedisSummaryJobStore
+
+        return RedisSummaryJobStore(redis_url, ttl_s=int(ttl_s) if ttl_s else None)
+    if redis_url:
+        # Celery workers are other processes; with an in-memory store the web
+        # process would never see their progress and jobs would hang as queued
+        scheme = redis_url.split(":", 1)[0]
+        raise RuntimeError(
+            f"Summary jobs need a shared Redis job store, not {scheme}; "
+            "set SUMMARY_JOBS_REDIS_URL to a redis:// URL"
+        )
+    return InMemorySummaryJobStore(ttl_s=ttl_s)
+
+
+summary_job_store = build_summary_job_store()
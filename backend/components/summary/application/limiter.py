@@ -0,0 +1,318 @@
+import abc
+import asyncio
+import os
+import threading
+import time
+import uuid
+from typing import AsyncIterator, Iterable, Iterator, Optional
+
+from components.shared.infrastructure.logger import logger
+from components.shared.infrastructure.tenant import get_current_tenant
+from components.summary.application.async_providers import AsyncSummaryProvider
+from components.summary.application.providers import (
+    ProviderStreamError,
+    QueuePosition,
+    SummaryProvider,
+)
+
+GLOBAL_KEY = "__global__"
+UNLIMITED = 2**31
+
+
+def _number_env(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, str(default)))
+    except ValueError:
+        return default
+
+
+def _tenant_limit() -> int:
+    return int(_number_env("LLM_TENANT_MAX_CONCURRENCY", 4)) or UNLIMITED
+
+
+class RateLimitQueueTimeout(ProviderStreamError):
+    def __init__(self, tenant: str):
+        super().__init__(f"Rate limited: tenant {tenant} waited too long for a slot")
+
+
+class LimiterStore(abc.ABC):
+    """Counters behind the limiter; shared stores make limits cluster-wide."""
+
+    @abc.abstractmethod
+    def acquire_slot(self, key: str, limit: int) -> Optional[str]:
+        """Lease one of ``limit`` slots; the lease id, or None when all are held."""
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def release_slot(self, key: str, lease: str) -> None:
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def take_tokens(
+        self, key: str, amount: float, rate_per_s: float, capacity: float
+    ) -> bool:
+        """Token bucket: take ``amount`` if available; a negative amount refunds."""
+        raise NotImplementedError
+
+
+class InMemoryLimiterStore(LimiterStore):
+    def __init__(self):
+        self._slots: dict[str, set[str]] = {}
+        self._buckets: dict[str, tuple[float, float]] = {}
+        self._lock = threading.Lock()
+
+    def acquire_slot(self, key: str, limit: int) -> Optional[str]:
+        with self._lock:
+            leases = self._slots.setdefault(key, set())
+            if len(leases) >= limit:
+                return None
+            lease = uuid.uuid4().hex
+            leases.add(lease)
+            return lease
+
+    def release_slot(self, key: str, lease: str) -> None:
+        with self._lock:
+            self._slots.get(key, set()).discard(lease)
+
+    def take_tokens(
+        self, key: str, amount: float, rate_per_s: float, capacity: float
+    ) -> bool:
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated_at = self._buckets.get(key, (capacity, now))
+            tokens = min(capacity, tokens + (now - updated_at) * rate_per_s)
+            if amount > tokens:
+                self._buckets[key] = (tokens, now)
+                return False
+            self._buckets[key] = (min(capacity, tokens - amount), now)
+            return True
+
+
+def build_limiter_store() -> LimiterStore:
+    redis_url = os.getenv("LLM_LIMITER_REDIS_URL")
+    if redis_url:
+        from components.summary.infrastructure.limiter_store import RedisLimiterStore
+
+        return RedisLimiterStore(redis_url)
+    return InMemoryLimiterStore()
+
+
+class ProviderLimiter:
+    """Per-tenant and global caps on concurrent provider calls, plus per-tenant
+    request and token budgets (token buckets refilled per minute).
+
+    Callers that cannot start immediately wait in a FIFO queue per tenant and
+    learn their position while waiting; a limit of 0 disables that check.
+    As many waiters from the head of the queue as the tenant has slots may
+    acquire, and releases wake this process's waiters without waiting out
+    the poll interval.
+    """
+
+    def __init__(self, store: Optional[LimiterStore] = None):
+        self._store = store or build_limiter_store()
+        self._waiting: dict[str, list[object]] = {}
+        # Leases this process holds, per tenant: (tenant lease, global lease).
+        # Calls of one tenant are interchangeable, so release() may return any.
+        self._leases: dict[str, list[tuple[str, str]]] = {}
+        self._lock = threading.Lock()
+        self._released = threading.Condition()
+
+    def wait(self, tenant: str, tokens: int) -> Iterator[int]:
+        """Yield the queue position until a slot is granted, then return."""
+        ticket = self._enqueue(tenant)
+        deadline = time.monotonic() + _number_env("LLM_QUEUE_TIMEOUT_S", 60)
+        poll_s = _number_env("LLM_QUEUE_POLL_S", 0.25)
+        try:
+            while True:
+                position = self._poll(tenant, ticket, tokens, deadline)
+                if position is None:
+                    return
+                yield position
+                with self._released:
+                    self._released.wait(poll_s)
+        finally:
+            self._dequeue(tenant, ticket)
+
+    async def wait_async(self, tenant: str, tokens: int) -> AsyncIterator[int]:
+        """Same as ``wait`` without blocking the event loop; the store may be
+        Redis, so polls run on a worker thread."""
+        ticket = self._enqueue(tenant)
+        deadline = time.monotonic() + _number_env("LLM_QUEUE_TIMEOUT_S", 60)
+        poll_s = _number_env("LLM_QUEUE_POLL_S", 0.25)
+        try:
+            while True:
+                position = await asyncio.to_thread(
+                    self._poll, tenant, ticket, tokens, deadline
+                )
+                if position is None:
+                    return
+                yield position
+                await asyncio.sleep(poll_s)
+        finally:
+            self._dequeue(tenant, ticket)
+
+    def _enqueue(self, tenant: str) -> object:
+        ticket = object()
+        with self._lock:
+            self._waiting.setdefault(tenant, []).append(ticket)
+        return ticket
+
+    def _dequeue(self, tenant: str, ticket: object) -> None:
+        with self._lock:
+            queue = self._waiting.get(tenant, [])
+            queue.remove(ticket)
+            if not queue:
+                self._waiting.pop(tenant, None)
+
+    def _poll(
+        self, tenant: str, ticket: object, tokens: int, deadline: float
+    ) -> Optional[int]:
+        # None once the slot is granted, else the caller's current position
+        with self._lock:
+            position = self._waiting[tenant].index(ticket) + 1
+        # Waiters further back could not get a slot even if all were free
+        if position <= _tenant_limit() and self._try_acquire(tenant, tokens):
+            return None
+        if time.monotonic() > deadline:
+            logger.warning(f"llm_queue_timeout tenant {tenant}")
+            raise RateLimitQueueTimeout(tenant)
+        return position
+
+    def try_acquire(self, tenant: str, tokens: int) -> bool:
+        """Take a slot without waiting, for optional extra calls such as
+        hedges; never ahead of callers already queued for one."""
+        with self._lock:
+            if self._waiting.get(tenant):
+                return False
+        return self._try_acquire(tenant, tokens)
+
+    def release(self, tenant: str) -> None:
+        """Give back the slots of a finished call and wake queued waiters."""
+        with self._lock:
+            held = self._leases.get(tenant)
+            if not held:
+                logger.warning(f"llm_limiter_release_without_lease tenant {tenant}")
+                return
+            leases = held.pop()
+            if not held:
+                self._leases.pop(tenant, None)
+        self._release_slots(tenant, leases)
+        with self._released:
+            self._released.notify_all()
+
+    def _release_slots(self, tenant: str, leases: tuple[str, str]) -> None:
+        # No wake-up: a waiter that fails its budget check must not wake the
+        # others, or they would all spin instead of polling
+        tenant_lease, global_lease = leases
+        self._store.release_slot(f"tenant:{tenant}", tenant_lease)
+        self._store.release_slot(GLOBAL_KEY, global_lease)
+
+    def _try_acquire(self, tenant: str, tokens: int) -> bool:
+        tenant_limit = _tenant_limit()
+        global_limit = int(_number_env("LLM_GLOBAL_MAX_CONCURRENCY", 16)) or UNLIMITED
+        tenant_key = f"tenant:{tenant}"
+
+        tenant_lease = self._store.acquire_slot(tenant_key, tenant_limit)
+        if tenant_lease is None:
+            return False
+        global_lease = self._store.acquire_slot(GLOBAL_KEY, global_limit)
+        if global_lease is None:
+            self._store.release_slot(tenant_key, tenant_lease)
+            return False
+        leases = (tenant_lease, global_lease)
+        if not self._take_budgets(tenant, tokens):
+            self._release_slots(tenant, leases)
+            return False
+        with self._lock:
+            self._leases.setdefault(tenant, []).append(leases)
+        return True
+
+    def _take_budgets(self, tenant: str, tokens: int) -> bool:
+        tokens_per_min = _number_env("LLM_TENANT_TOKENS_PER_MIN", 0)
+        requests_per_min = _number_env("LLM_TENANT_REQUESTS_PER_MIN", 0)
+        tokens_key, requests_key = f"tokens:{tenant}", f"requests:{tenant}"
+
+        if tokens_per_min:
+            # A single oversized request may drain the whole bucket but not more
+            amount = min(tokens, tokens_per_min)
+            if not self._store.take_tokens(
+                tokens_key, amount, tokens_per_min / 60, tokens_per_min
+            ):
+                return False
+        if requests_per_min and not self._store.take_tokens(
+            requests_key, 1, requests_per_min / 60, requests_per_min
+        ):
+            if tokens_per_min:
+                self._store.take_tokens(
+                    tokens_key, -amount, tokens_per_min / 60, tokens_per_min
+                )
+            return False
+        return True
+
+
+provider_limiter = ProviderLimiter()
+
+
+def request_tokens(content_html: str) -> int:
+    # Budget the prompt (~4 chars per token) plus the maximum output
+    return len(content_html or "") // 4 + int(
+        _number_env("LLM_MAX_OUTPUT_TOKENS", 2048)
+    )
+
+
+class LimitedProvider(SummaryProvider):
+    """Runs the wrapped provider only once the limiter grants a slot.
+
+    While queued it yields QueuePosition items so the SSE stream can show the
+    caller's place in line instead of failing immediately.
+    """
+
+    def __init__(self, inner: SummaryProvider, limiter: ProviderLimiter = None):
+        self._inner = inner
+        self._limiter = limiter or provider_limiter
+
+    @property
+    def model_name(self) -> Optional[str]:
+        return self._inner.model_name
+
+    def stream_summary(self, content_html: str, options: dict) -> Iterable[str]:
+        tenant = get_current_tenant() or "unknown"
+        tokens = request_tokens(content_html)
+        last_position = None
+        for position in self._limiter.wait(tenant, tokens):
+            if position != last_position:
+                last_position = position
+                yield QueuePosition(position)
+        try:
+            yield from self._inner.stream_summary(content_html, options)
+        finally:
+            self._limiter.release(tenant)
+
+
+class AsyncLimitedProvider(AsyncSummaryProvider):
+    """LimitedProvider for the asyncio path; the tenant is read once up front
+    because the event loop thread serves many tenants."""
+
+    def __init__(self, inner: AsyncSummaryProvider, limiter: ProviderLimiter = None):
+        self._inner = inner
+        self._limiter = limiter or provider_limiter
+        self._tenant = get_current_tenant() or "unknown"
+
+    @property
+    def model_name(self) -> Optional[str]:
+        return self._inner.model_name
+
+    async def stream_summary(
+        self, content_html: str, options: dict
+    ) -> AsyncIterator[str]:
+        tokens = request_tokens(content_html)
+        last_position = None
+        async for position in self._limiter.wait_async(self._tenant, tokens):
+            if position != last_position:
+                last_position = position
+                yield QueuePosition(position)
+        try:
+            async for chunk in self._inner.stream_summary(content_html, options):
+                yield chunk
+        finally:
+            await asyncio.to_thread(self._limiter.release, self._tenant)
@@ -0,0 +1,245 @@
+import html
+import re
+from html.parser import HTMLParser
+from typing import Iterable, Optional
+
+from components.shared.infrastructure.logger import logger
+from components.summary.application.prompts import (
+    COMPACT_FORMAT_NOTE,
+    COMPACT_SUMMARY_INSTRUCTION,
+    REVISE_SUMMARY_INSTRUCTION,
+)
+from components.summary.application.providers import SummaryProvider
+
+PREPROCESS_HTML = "html"
+PREPROCESS_COMPACT = "compact"
+
+_BLOCK_TAGS = {"p", "div", "section", "article", "blockquote", "pre", "br", "hr"}
+_SKIP_TAGS = {"script", "style", "head", "title"}
+_WHITESPACE = re.compile(r"\s+")
+
+
+class _OutlineBuilder(HTMLParser):
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.lines: list[str] = []
+        self._line: list[str] = []
+        self._prefix = ""
+        self._lists: list[list] = []
+        self._row: Optional[list[str]] = None
+        self._cell: Optional[list[str]] = None
+        self._skip = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in _SKIP_TAGS:
+            self._skip += 1
+        elif tag in ("h1", "h2", "h3", "h4", "h5", "h6"):
+            self._break()
+            self._prefix = "#" * int(tag[1]) + " "
+        elif tag in ("ul", "ol"):
+            self._break()
+            self._lists.append([tag, 0])
+        elif tag == "li":
+            self._break()
+            indent = "  " * max(0, len(self._lists) - 1)
+            if self._lists and self._lists[-1][0] == "ol":
+                self._lists[-1][1] += 1
+                self._prefix = f"{indent}{self._lists[-1][1]}. "
+            else:
+                self._prefix = f"{indent}- "
+        elif tag == "tr":
+            self._break()
+            self._row = []
+        elif tag in ("td", "th"):
+            self._cell = []
+        elif tag in _BLOCK_TAGS:
+            # TipTap wraps list item text in <p>: keep the item's marker
+            self._break(keep_prefix=True)
+
+    def handle_endtag(self, tag):
+        if tag in _SKIP_TAGS:
+            self._skip = max(0, self._skip - 1)
+        elif tag in ("ul", "ol"):
+            self._break()
+            if self._lists:
+                self._lists.pop()
+        elif tag in ("td", "th") and self._row is not None and self._cell is not None:
+            self._row.append(_WHITESPACE.sub(" ", "".join(self._cell)).strip())
+            self._cell = None
+        elif tag == "tr" and self._row is not None:
+            self.lines.append("| " + " | ".join(self._row) + " |")
+            self._row = None
+        elif tag in ("h1", "h2", "h3", "h4", "h5", "h6", "li") or tag in _BLOCK_TAGS:
+            self._break()
+
+    def handle_data(self, data):
+        if self._skip:
+            return
+        if self._cell is not None:
+            self._cell.append(data)
+        else:
+            self._line.append(data)
+
+    def _break(self, keep_prefix: bool = False):
+        text = _WHITESPACE.sub(" ", "".join(self._line)).strip()
+        if text:
+            self.lines.append(self._prefix + text)
+        elif keep_prefix:
+            return
+        self._line = []
+        self._prefix = ""
+
+    def close(self):
+        super().close()
+        self._break()
+
+
+def compact_html(content_html: str) -> str:
+    """Render HTML as a plain-text outline: headings, lists, paragraphs, tables.
+
+    Inline markup, attributes and indentation whitespace are dropped, which is
+    where most of the prompt tokens of editor-produced HTML go.
+    """
+    builder = _OutlineBuilder()
+    builder.feed(content_html or "")
+    builder.close()
+    return "\n".join(builder.lines)
+
+
+def estimate_tokens(text: str) -> int:
+    # ~4 characters per token is close enough for English text and markup
+    return (len(text) + 3) // 4
+
+
+_HEADING_LINE = re.compile(r"^(#{1,6})\s+(.*)$")
+_BULLET_LINE = re.compile(r"^\s*[-*]\s+(.*)$")
+_ORDERED_LINE = re.compile(r"^\s*\d+[.)]\s+(.*)$")
+_TABLE_SEPARATOR = re.compile(r"^\|?\s*:?-{2,}")
+_STRONG = re.compile(r"\*\*(.+?)\*\*")
+
+
+class OutlineToHtml:
+    """Streams outline-formatted model output back into HTML fragments.
+
+    Lines are converted as soon as their newline arrives; list and table
+    containers are closed when the block ends or the stream is flushed. If the
+    model answers in HTML anyway, the output is passed through untouched.
+    """
+
+    def __init__(self):
+        self._pending = ""
+        self._passthrough: Optional[bool] = None
+        self._open: Optional[str] = None
+
+    def feed(self, text: str) -> str:
+        if self._passthrough is None:
+            head = (self._pending + text).lstrip()
+            if not head:
+                self._pending += text
+                return ""
+            self._passthrough = head.startswith("<")
+        if self._passthrough:
+            out, self._pending = self._pending + text, ""
+            return out
+
+        self._pending += text
+        out = []
+        while "\n" in self._pending:
+            line, self._pending = self._pending.split("\n", 1)
+            out.append(self._convert(line))
+        return "".join(out)
+
+    def flush(self) -> str:
+        if self._passthrough:
+            out, self._pending = self._pending, ""
+            return out
+        out = self._convert(self._pending) if self._pending else ""
+        self._pending = ""
+        return out + self._close()
+
+    def _close(self) -> str:
+        closing = f"</{self._open}>" if self._open else ""
+        self._open = None
+        return closing
+
+    def _container(self, tag: str) -> str:
+        if self._open == tag:
+            return ""
+        opening = self._close() + f"<{tag}>"
+        self._open = tag
+        return opening
+
+    @staticmethod
+    def _inline(text: str) -> str:
+        return _STRONG.sub(r"<strong>\1</strong>", html.escape(text.strip()))
+
+    def _convert(self, line: str) -> str:
+        if not line.strip():
+            return self._close()
+        heading = _HEADING_LINE.match(line)
+        if heading:
+            level = len(heading.group(1))
+            return (
+                self._close() + f"<h{level}>{self._inline(heading.group(2))}</h{level}>"
+            )
+        bullet = _BULLET_LINE.match(line)
+        if bullet:
+            return self._container("ul") + f"<li>{self._inline(bullet.group(1))}</li>"
+        ordered = _ORDERED_LINE.match(line)
+        if ordered:
+            return self._container("ol") + f"<li>{self._inline(ordered.group(1))}</li>"
+        if line.strip().startswith("|"):
+            if _TABLE_SEPARATOR.match(line.strip()):
+                return ""
+            cells = [cell for cell in line.strip().strip("|").split("|")]
+            row = "".join(f"<td>{self._inline(cell)}</td>" for cell in cells)
+            return self._container("table") + f"<tr>{row}</tr>"
+        return self._close() + f"<p>{self._inline(line)}</p>"
+
+
+class CompactingProvider(SummaryProvider):
+    """Sends a compact outline of the document instead of raw HTML.
+
+    The model is asked to answer in the same outline format, and the answer is
+    converted back to HTML on the fly, cutting both input and output tokens.
+    """
+
+    def __init__(self, inner: SummaryProvider):
+        self._inner = inner
+
+    @property
+    def model_name(self) -> Optional[str]:
+        # Distinct cache identity: compact and HTML summaries are not interchangeable
+        return f"{self._inner.model_name}+{PREPROCESS_COMPACT}"
+
+    def stream_summary(self, content_html: str, options: dict) -> Iterable[str]:
+        if options.get("instruction") == REVISE_SUMMARY_INSTRUCTION:
+            # The outline would drop the markers telling the model what changed
+            yield from self._inner.stream_summary(content_html, options)
+            return
+        compact = compact_html(content_html)
+        before, after = estimate_tokens(content_html or ""), estimate_tokens(compact)
+        logger.info(
+            f"summary_prompt_compacted tokens {before} -> {after}"
+            f" ({100 - (100 * after // max(before, 1))}% fewer)"
+        )
+
+        compact_options = dict(options)
+        instruction = options.get("instruction")
+        compact_options["instruction"] = (
+            f"{instruction}\n{COMPACT_FORMAT_NOTE}"
+            if instruction
+            else COMPACT_SUMMARY_INSTRUCTION
+        )
+
+        converter = OutlineToHtml()
+        for chunk in self._inner.stream_summary(compact, compact_options):
+            if not isinstance(chunk, str):
+                yield chunk
+                continue
+            text = converter.feed(chunk)
+            if text:
+                yield text
+        tail = converter.flush()
+        if tail:
+            yield tail
@@ -3,6 +3,9 @@ from __future__ import annotations
 
 from typing import Optional
 
+# Bump whenever the templates below change so cached summaries are not reused
+PROMPT_VERSION = "1"
+
 # System instruction used by legacy google-generativeai client
 SYSTEM_INSTRUCTION_HTML = (
     "You are an assistant that produces concise, well-structured HTML. "
@@ -12,6 +15,20 @@ SYSTEM_INSTRUCTION_HTML = (
 # Default instruction appended to the user content when building prompts
 DEFAULT_SUMMARY_INSTRUCTION = "Summarize the following HTML into concise, well-structured HTML paragraphs. Try to reduce the content to 40% of its original length, trying to keep the most important information."
 
+# Map step of hierarchical summarization: one section of a larger document
+SECTION_SUMMARY_INSTRUCTION = "Summarize the following section of a longer HTML document into concise HTML. Keep names, amounts, dates, obligations and defined terms; do not add an introduction or conclusion."
+
+# Reduce step: combine the section summaries into the final document summary
+REDUCE_SUMMARY_INSTRUCTION = "The following HTML contains summaries of consecutive sections of one document. Merge them into a single concise, well-structured HTML summary of the whole document, removing repetition and keeping the most important information."
+
+# Compact preprocessing: the document is sent as a plain-text outline and the
+# answer is expected in the same format, then converted back to HTML
+COMPACT_FORMAT_NOTE = "The document is given as a plain-text outline: lines starting with '#' are headings, '-' or '1.' are list items, '|' separates table cells and other lines are paragraphs. Answer in the same outline format, not HTML."
+COMPACT_SUMMARY_INSTRUCTION = f"Summarize the following document into a concise, well-structured outline. Try to reduce the content to 40% of its original length, trying to keep the most important information.\n{COMPACT_FORMAT_NOTE}"
+
+# Incremental regeneration: revise an existing summary after document edits
+REVISE_SUMMARY_INSTRUCTION = "Below is an existing HTML summary of a document, followed by the parts of the document that were removed, added or changed since the summary was written. Update the summary to reflect these changes: revise only the affected parts, keep everything else as it is, and return the complete updated summary as HTML."
+
 
 def build_summary_prompt(content_html: str, instruction: Optional[str] = None) -> str:
     """Compose the LLM prompt for summarization.
@@ -1,11 +1,15 @@
+import hashlib
 import os
+import threading
 import time
-from typing import Iterable, Optional
+from collections import OrderedDict
+from typing import Callable, Iterable, Optional
 
 from components.shared.infrastructure.errors import NoConfigForTenant
 from components.shared.infrastructure.logger import logger
 from components.shared.infrastructure.secrets_manager import secrets_manager
 from components.shared.infrastructure.tenant import get_current_tenant
+from components.summary.application import resilience
 from components.summary.application.prompts import (
     SYSTEM_INSTRUCTION_HTML,
     build_summary_prompt,
@@ -13,15 +17,92 @@ from components.summary.application.prompts import (
 
 
 class SummaryProvider:
+    model_name: Optional[str] = None
+    # False when the client holds process-global state (such as an API key)
+    # and must not be reused across tenants
+    poolable: bool = True
+
     def stream_summary(self, content_html: str, options: dict) -> Iterable[str]:
+        # options["cancel"], when present, is a threading.Event set once the
+        # caller has stopped reading; providers should stop as soon as they can
         raise NotImplementedError
 
 
 class ProviderStreamError(Exception):
-    pass
+    def __init__(self, message: str = "", kind: Optional[str] = None):
+        super().__init__(message)
+        self.kind = kind
+
+
+class ProviderUnavailable(ProviderStreamError):
+    def __init__(self, provider: str, model: Optional[str]):
+        super().__init__(
+            f"{provider} {model} temporarily unavailable (circuit open)",
+            kind=resilience.ERROR_TRANSIENT,
+        )
+
+
+class QueuePosition:
+    """Out-of-band stream item: the request is waiting for a provider slot.
+
+    Provider streams yield text chunks (str); consumers that aggregate text
+    skip anything else and pass it through.
+    """
+
+    def __init__(self, position: int):
+        self.position = position
+
+
+class CodeFenceStripper:
+    """Removes markdown code fences from streamed model output.
+
+    A fence may be split across provider chunks (e.g. "``" + "`html"), so the
+    opening of the stream and any trailing backticks are held back until the
+    next chunk shows whether they form a fence.
+    """
+
+    FENCE = "```"
+    OPENING = "```html\n"
+
+    def __init__(self):
+        self._pending = ""
+        self._started = False
+
+    def feed(self, text: str) -> str:
+        self._pending += text
+        if not self._started:
+            head = self._pending.lstrip()
+            if len(head) < len(self.OPENING) and self.OPENING.startswith(head):
+                return ""
+            self._pending = self._strip_opening(head)
+            self._started = True
+
+        held = len(self._pending) - len(self._pending.rstrip("`"))
+        ready = self._pending[: len(self._pending) - held]
+        self._pending = self._pending[len(ready) :]
+        return ready.replace(self.FENCE, "")
+
+    def flush(self) -> str:
+        tail = self._pending
+        if not self._started:
+            tail = self._strip_opening(tail.lstrip())
+        self._pending = ""
+        self._started = True
+        return tail.replace(self.FENCE, "")
+
+    def _strip_opening(self, text: str) -> str:
+        if text.startswith(self.FENCE):
+            text = text[3:]
+            if text.startswith("html"):
+                text = text[4:]
+                if text.startswith("\n"):
+                    text = text[1:]
+        return text
 
 
 class MockProvider(SummaryProvider):
+    model_name = "mock"
+
     def stream_summary(self, content_html: str, options: dict) -> Iterable[str]:
         # Very naive summary to avoid fixed placeholder text
         text = options.get(
@@ -63,7 +144,12 @@ def _resolve_model() -> Optional[str]:
     )
 
 
+_LEGACY_CONFIGURE_LOCK = threading.Lock()
+
+
 class GeminiProvider(SummaryProvider):
+    provider_name = "gemini"
+
     def __init__(self, api_key: Optional[str] = None, model: Optional[str] = None):
         self._use_new = False
         self._model_name = model or os.getenv("LLM_GOOGLE_MODEL")
@@ -72,6 +158,12 @@ class GeminiProvider(SummaryProvider):
             self._backoff = max(0.0, float(os.getenv("LLM_RETRY_BACKOFF_S", "0.5")))
         except ValueError:
             self._backoff = 0.5
+        try:
+            self._max_retry_wait = max(
+                0.0, float(os.getenv("LLM_RETRY_MAX_WAIT_S", "10"))
+            )
+        except ValueError:
+            self._max_retry_wait = 10.0
 
         # Try new google-genai client first
         try:
@@ -92,11 +184,8 @@ class GeminiProvider(SummaryProvider):
             import google.generativeai as genai  # type: ignore
 
             self._genai = genai
-            if api_key:
-                self._genai.configure(api_key=api_key)
-            else:
-                # Also allow GEMINI_API_KEY env to be picked up by the SDK
-                self._genai.configure()
+            self._api_key = api_key
+            self._configure_legacy()
             if not self._model_name:
                 self._model_name = "gemini-1.5-flash"
             self._model = self._genai.GenerativeModel(
@@ -110,27 +199,24 @@ class GeminiProvider(SummaryProvider):
                 system_instruction=SYSTEM_INSTRUCTION_HTML,
             )
 
-    @staticmethod
-    def _strip_code_fences(text: str, first_chunk: bool) -> tuple[str, bool]:
-        if first_chunk:
-            t = text.lstrip()
-            if t.startswith("```"):
-                t = t[3:]
-                if t.startswith("html"):
-                    t = t[4:]
-                    if t.startswith("\n"):
-                        t = t[1:]
-            text = t
-            first_chunk = False
-        if "```" in text:
-            text = text.replace("```", "")
-        return text, first_chunk
-
-    def _yield_in_chunks(self, text: str, size: int = 512) -> Iterable[str]:
-        for i in range(0, len(text), size):
-            chunk = text[i : i + size]
-            if chunk:
-                yield chunk
+    @property
+    def poolable(self) -> bool:
+        # The legacy SDK keeps one API key per process, not per client
+        return self._use_new
+
+    def _configure_legacy(self) -> None:
+        if self._api_key:
+            self._genai.configure(api_key=self._api_key)
+        else:
+            # Also allow GEMINI_API_KEY env to be picked up by the SDK
+            self._genai.configure()
+
+    def _request_legacy(self, prompt: str):
+        # The model binds the SDK's global client on its first request, so
+        # configure and call together before another tenant can reconfigure
+        with _LEGACY_CONFIGURE_LOCK:
+            self._configure_legacy()
+            return self._model.generate_content(prompt, stream=True)
 
     def _build_new_config(self):
         try:
@@ -151,69 +237,303 @@ class GeminiProvider(SummaryProvider):
     def _request_new_client(self, prompt: str):
         config = self._build_new_config()
         if config is not None:
-            return self._client.models.generate_content(
+            return self._client.models.generate_content_stream(
                 model=self._model_name, contents=prompt, config=config
             )
-        return self._client.models.generate_content(
+        return self._client.models.generate_content_stream(
             model=self._model_name, contents=prompt
         )
 
-    def _stream_with_new_client(self, prompt: str) -> Iterable[str]:
+    def _stream_with_retries(
+        self,
+        open_stream: Callable[[], Iterable],
+        log_prefix: str,
+        fail_message: str,
+        cancel: Optional[threading.Event] = None,
+    ) -> Iterable[str]:
+        # Retrying once text has reached the client would duplicate it, so only
+        # failures before the first emitted chunk are retried. Auth errors are
+        # never retried and the whole retry sequence is capped in wall time.
+        # A set ``cancel`` (the caller no longer wants the result) closes the
+        # SDK stream at its next chunk and stops any retry or backoff.
+        cancel = cancel or threading.Event()
+        breaker = resilience.circuit_breakers.get(self.provider_name, self._model_name)
+        deadline = time.monotonic() + self._max_retry_wait
         last_err: Optional[Exception] = None
         for attempt in range(self._attempts):
-            try:
-                resp = self._request_new_client(prompt)
-                text = getattr(resp, "text", None) or ""
-                first_chunk = True
-                for part in self._yield_in_chunks(text, size=600):
-                    part, first_chunk = self._strip_code_fences(part, first_chunk)
-                    if part:
-                        yield part
+            if cancel.is_set():
                 return
-            except Exception as e:
-                last_err = e
-                logger.warning("genai_client_retry", extra={"attempt": attempt + 1})
-                if attempt < self._attempts - 1:
-                    time.sleep(self._backoff * (2**attempt))
-        logger.exception("genai_client_error", exc_info=True)
-        raise ProviderStreamError(str(last_err) if last_err else "LLM request failed")
-
-    def _stream_with_legacy(self, prompt: str) -> Iterable[str]:
-        last_err: Optional[Exception] = None
-        for attempt in range(self._attempts):
+            self._check_circuit(breaker, log_prefix)
+            emitted = False
+            fences = CodeFenceStripper()
+            stream = None
             try:
-                stream = self._model.generate_content(prompt, stream=True)
-                first_chunk = True
+                stream = open_stream()
                 for chunk in stream:
-                    text = getattr(chunk, "text", None)
-                    if not text:
-                        continue
-                    text, first_chunk = self._strip_code_fences(text, first_chunk)
+                    if cancel.is_set():
+                        logger.info(f"{log_prefix}_cancelled")
+                        return
+                    text = fences.feed(getattr(chunk, "text", None) or "")
                     if text:
+                        if not emitted:
+                            breaker.record_success()
+                        emitted = True
                         yield text
+                tail = fences.flush()
+                if tail:
+                    yield tail
+                breaker.record_success()
                 return
             except Exception as e:
                 last_err = e
-                logger.warning("gemini_stream_retry", extra={"attempt": attempt + 1})
-                if attempt < self._attempts - 1:
-                    time.sleep(self._backoff * (2**attempt))
-        logger.exception("gemini_stream_error", exc_info=True)
-        raise ProviderStreamError(str(last_err) if last_err else "LLM stream failed")
+                delay = self._retry_delay(
+                    e, attempt, emitted, deadline, breaker, log_prefix
+                )
+                if delay is None:
+                    break
+                if cancel.wait(delay):
+                    return
+            finally:
+                close = getattr(stream, "close", None)
+                if close:
+                    close()
+        raise self._retries_exhausted(last_err, log_prefix, fail_message)
+
+    def _check_circuit(self, breaker: resilience.CircuitBreaker, log_prefix: str):
+        if not breaker.allow():
+            logger.warning(f"{log_prefix}_circuit_open")
+            raise ProviderUnavailable(self.provider_name, self._model_name)
+
+    def _retry_delay(
+        self,
+        err: Exception,
+        attempt: int,
+        emitted: bool,
+        deadline: float,
+        breaker: resilience.CircuitBreaker,
+        log_prefix: str,
+    ) -> Optional[float]:
+        """Seconds to wait before the next attempt, None to give up; raises
+        for errors that must not be retried."""
+        kind = resilience.classify_error(err)
+        if kind == resilience.ERROR_AUTH:
+            # The provider answered; the problem is our credentials
+            breaker.record_success()
+            logger.exception(f"{log_prefix}_auth_error", exc_info=True)
+            raise ProviderStreamError(str(err), kind=kind) from err
+        if kind != resilience.ERROR_QUOTA:
+            # Quota is per API key, i.e. per tenant, while the breaker is
+            # shared: one tenant running out must not fail everyone else fast
+            breaker.record_failure()
+        if emitted:
+            logger.exception(f"{log_prefix}_error_mid_stream", exc_info=True)
+            raise ProviderStreamError(str(err), kind=kind) from err
+        logger.warning(
+            f"{log_prefix}_retry", extra={"attempt": attempt + 1, "kind": kind}
+        )
+        if attempt == self._attempts - 1:
+            return None
+        delay = None
+        if kind == resilience.ERROR_QUOTA:
+            delay = resilience.retry_after_hint(err)
+        if delay is None:
+            delay = resilience.backoff_delay(
+                attempt, self._backoff, self._max_retry_wait
+            )
+        if time.monotonic() + delay > deadline:
+            # Fail now rather than sleep past the retry budget
+            return None
+        return delay
+
+    def _retries_exhausted(
+        self, last_err: Optional[Exception], log_prefix: str, fail_message: str
+    ) -> ProviderStreamError:
+        logger.exception(f"{log_prefix}_error", exc_info=True)
+        if last_err is None:
+            return ProviderStreamError(fail_message)
+        return ProviderStreamError(
+            str(last_err), kind=resilience.classify_error(last_err)
+        )
+
+    def _stream_with_new_client(
+        self, prompt: str, cancel: Optional[threading.Event] = None
+    ) -> Iterable[str]:
+        yield from self._stream_with_retries(
+            lambda: self._request_new_client(prompt),
+            log_prefix="genai_client",
+            fail_message="LLM request failed",
+            cancel=cancel,
+        )
+
+    def _stream_with_legacy(
+        self, prompt: str, cancel: Optional[threading.Event] = None
+    ) -> Iterable[str]:
+        yield from self._stream_with_retries(
+            lambda: self._request_legacy(prompt),
+            log_prefix="gemini_stream",
+            fail_message="LLM stream failed",
+            cancel=cancel,
+        )
 
     def stream_summary(self, content_html: str, options: dict) -> Iterable[str]:
         instruction = options.get("instruction")
         prompt = build_summary_prompt(content_html, instruction)
+        cancel = options.get("cancel")
         if self._use_new:
-            yield from self._stream_with_new_client(prompt)
+            yield from self._stream_with_new_client(prompt, cancel)
         else:
-            yield from self._stream_with_legacy(prompt)
+            yield from self._stream_with_legacy(prompt, cancel)
+
+    @property
+    def model_name(self) -> Optional[str]:
+        return self._model_name
+
+
+def _generation_settings() -> tuple:
+    return (
+        os.getenv("LLM_TEMPERATURE", "0.3"),
+        os.getenv("LLM_MAX_OUTPUT_TOKENS", "2048"),
+        os.getenv("LLM_THINKING_BUDGET", "0"),
+    )
+
+
+def _fingerprint(secret: str) -> str:
+    return hashlib.sha256(secret.encode("utf-8")).hexdigest()[:16]
+
+
+BACKEND_GEMINI = "gemini"
+BACKEND_MOCK = "mock"
+
+
+class ProviderRegistry:
+    """Process-wide pool of provider clients, reused across requests.
+
+    Entries are keyed by (tenant, backend, api key fingerprint, model,
+    generation settings) so each client keeps its HTTP connections warm. When
+    a tenant's key or settings change, its stale clients for that backend are
+    dropped the next time the tenant asks for a provider. Further backends
+    (other vendors) are added with ``register``.
+    """
+
+    def __init__(
+        self,
+        provider_factory: Callable[..., SummaryProvider] = None,
+        max_entries: Optional[int] = None,
+    ):
+        self._provider_factory = provider_factory or GeminiProvider
+        self._factories: dict[str, Callable[..., SummaryProvider]] = {
+            BACKEND_MOCK: lambda api_key, model: MockProvider(),
+        }
+        self._max_entries = max_entries or int(
+            os.getenv("LLM_PROVIDER_POOL_SIZE", "64")
+        )
+        self._providers: "OrderedDict[tuple, SummaryProvider]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def register(self, backend: str, factory: Callable[..., SummaryProvider]) -> None:
+        self._factories[backend] = factory
+
+    def has_backend(self, backend: str) -> bool:
+        return backend == BACKEND_GEMINI or backend in self._factories
+
+    def get(
+        self,
+        tenant: str,
+        api_key: str,
+        model: Optional[str],
+        backend: str = BACKEND_GEMINI,
+    ) -> SummaryProvider:
+        credentials = (_fingerprint(api_key), _generation_settings())
+        key = (tenant, backend, model) + credentials
+        with self._lock:
+            provider = self._providers.get(key)
+            if provider is not None:
+                self._providers.move_to_end(key)
+                return provider
+
+            for stale in [
+                k
+                for k in self._providers
+                if k[:2] == (tenant, backend) and k[3:] != credentials
+            ]:
+                logger.info(f"Evicting rotated provider client for tenant {tenant}")
+                del self._providers[stale]
+
+            factory = (
+                self._provider_factory
+                if backend == BACKEND_GEMINI
+                else self._factories[backend]
+            )
+            provider = factory(api_key=api_key, model=model)
+            if not provider.poolable:
+                return provider
+            self._providers[key] = provider
+            while len(self._providers) > self._max_entries:
+                self._providers.popitem(last=False)
+            return provider
+
+    def evict(self, tenant: Optional[str] = None) -> None:
+        with self._lock:
+            if tenant is None:
+                self._providers.clear()
+                return
+            for stale in [k for k in self._providers if k[0] == tenant]:
+                del self._providers[stale]
+
+
+provider_registry = ProviderRegistry()
+
+
+def _resolve_preprocessing() -> str:
+    # "compact" sends a text outline instead of raw HTML; tenants can opt in/out
+    return (
+        _tenant_secret(["SUMMARY_PREPROCESS"])
+        or os.getenv("SUMMARY_PREPROCESS", "html")
+    ).lower()
+
+
+def _resolve_routes() -> list[tuple[str, Optional[str]]]:
+    # "gemini:gemini-2.5-flash,gemini:gemini-2.0-flash-lite,mock" -> backends in
+    # preference order; defaults to the single tenant model on Gemini
+    raw = _tenant_secret(["LLM_ROUTES"]) or os.getenv("LLM_ROUTES", "")
+    routes = []
+    for entry in raw.split(","):
+        backend, _, model = entry.strip().partition(":")
+        if not backend:
+            continue
+        if not provider_registry.has_backend(backend):
+            logger.warning(f"Ignoring unknown LLM route backend {backend}")
+            continue
+        routes.append((backend, model or None))
+    return routes or [(BACKEND_GEMINI, _resolve_model())]
 
 
 def get_provider() -> SummaryProvider:
     # Tenant-aware resolution with safe fallbacks, but require an API key
     api_key = _resolve_api_key()
-    model = _resolve_model()
+    tenant = get_current_tenant() or "unknown"
     if not api_key:
-        tenant = get_current_tenant() or "unknown"
         raise NoConfigForTenant(tenant)
-    return GeminiProvider(api_key=api_key, model=model)
+    routes = _resolve_routes()
+    backends = [
+        (
+            f"{backend}:{model}" if model else backend,
+            provider_registry.get(tenant, api_key, model, backend=backend),
+        )
+        for backend, model in routes
+    ]
+    if len(backends) == 1:
+        provider = backends[0][1]
+    else:
+        from components.summary.application.routing import RoutingProvider
+
+        provider = RoutingProvider(backends)
+
+    from components.summary.application.limiter import LimitedProvider
+
+    provider = LimitedProvider(provider)
+    if _resolve_preprocessing() == "compact":
+        from components.summary.application.preprocessing import CompactingProvider
+
+        provider = CompactingProvider(provider)
+    return provider
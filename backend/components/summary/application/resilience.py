@@ -0,0 +1,149 @@
+import os
+import random
+import re
+import threading
+import time
+from typing import Optional
+
+ERROR_AUTH = "auth"
+ERROR_QUOTA = "quota"
+ERROR_TRANSIENT = "transient"
+ERROR_UNKNOWN = "unknown"
+
+_AUTH_HINTS = ("api key", "permission", "unauthorized", "forbidden", "invalid key")
+# Whole words only ("_" separates them, as in RATE_LIMIT_EXCEEDED): a bare
+# "rate" would match "generateContent"
+_QUOTA_PATTERN = re.compile(
+    r"(?<![a-z0-9])(?:429|quota|rate[ _-]?limit(?:ed|s)?|resource[ _]?exhausted"
+    r"|resourceexhausted|too many requests)(?![a-z0-9])"
+)
+_QUOTA_ERROR_TYPES = ("ResourceExhausted", "TooManyRequests", "RateLimitError")
+_TRANSIENT_HINTS = ("timeout", "deadline", "unavailable", "temporarily", "connection")
+_RETRY_DELAY = re.compile(
+    r"retry(?:[ _-]?delay|[ _-]?after| in)?[\"']?\s*[:=]?\s*[\"']?(\d+(?:\.\d+)?)\s*s",
+    re.IGNORECASE,
+)
+
+
+def _status_code(err: BaseException) -> Optional[int]:
+    for attr in ("code", "status_code"):
+        value = getattr(err, attr, None)
+        if isinstance(value, int):
+            return value
+    response = getattr(err, "response", None)
+    value = getattr(response, "status_code", None)
+    return value if isinstance(value, int) else None
+
+
+def classify_error(err: BaseException) -> str:
+    """Bucket a provider error: auth errors never succeed on retry, quota errors
+    may after the advertised delay, transient ones after a backoff."""
+    status = _status_code(err)
+    if status in (401, 403):
+        return ERROR_AUTH
+    if status == 429:
+        return ERROR_QUOTA
+    if status is not None and (status >= 500 or status == 408):
+        return ERROR_TRANSIENT
+
+    if err.__class__.__name__ in _QUOTA_ERROR_TYPES:
+        return ERROR_QUOTA
+    message = f"{err.__class__.__name__} {err}".lower()
+    if any(hint in message for hint in _AUTH_HINTS):
+        return ERROR_AUTH
+    if _QUOTA_PATTERN.search(message):
+        return ERROR_QUOTA
+    if isinstance(err, (TimeoutError, ConnectionError)) or any(
+        hint in message for hint in _TRANSIENT_HINTS
+    ):
+        return ERROR_TRANSIENT
+    return ERROR_UNKNOWN
+
+
+def retry_after_hint(err: BaseException) -> Optional[float]:
+    """Delay in seconds the provider asked for, if it said so."""
+    response = getattr(err, "response", None)
+    headers = getattr(response, "headers", None) or {}
+    try:
+        header = headers.get("retry-after") or headers.get("Retry-After")
+        if header:
+            return float(header)
+    except (AttributeError, TypeError, ValueError):
+        pass
+    match = _RETRY_DELAY.search(f"{getattr(err, 'details', '')} {err}")
+    return float(match.group(1)) if match else None
+
+
+def backoff_delay(attempt: int, base_s: float, cap_s: float) -> float:
+    # Full jitter spreads retries from many workers instead of synchronizing them
+    return random.uniform(0, min(cap_s, base_s * (2**attempt)))
+
+
+class CircuitBreaker:
+    """Consecutive-failure breaker with a single half-open probe.
+
+    After ``failure_threshold`` consecutive failures the circuit opens and
+    calls fail fast for ``reset_timeout_s``; then one probe call is let
+    through and its outcome closes or re-opens the circuit.
+    """
+
+    def __init__(self, failure_threshold: int, reset_timeout_s: float):
+        self._failure_threshold = failure_threshold
+        self._reset_timeout_s = reset_timeout_s
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._probing = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        if self._opened_at is None:
+            return "closed"
+        return "half-open" if self._probing else "open"
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self._opened_at is None:
+                return True
+            # A probe whose caller went away without reporting back must not
+            # keep the circuit open forever, so it expires like the open state
+            now = time.monotonic()
+            if now - self._opened_at >= self._reset_timeout_s:
+                self._opened_at = now
+                self._probing = True
+                return True
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._probing = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if self._probing or self._failures >= self._failure_threshold:
+                self._opened_at = time.monotonic()
+            self._probing = False
+
+
+class CircuitBreakerRegistry:
+    def __init__(self):
+        self._breakers: dict[tuple, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+
+    def get(self, provider: str, model: Optional[str]) -> CircuitBreaker:
+        key = (provider, model)
+        with self._lock:
+            breaker = self._breakers.get(key)
+            if breaker is None:
+                breaker = CircuitBreaker(
+                    failure_threshold=int(os.getenv("LLM_CIRCUIT_FAILURES", "5")),
+                    reset_timeout_s=float(os.getenv("LLM_CIRCUIT_RESET_S", "30")),
+                )
+                self._breakers[key] = breaker
+            return breaker
+
+
+circuit_breakers = CircuitBreakerRegistry()
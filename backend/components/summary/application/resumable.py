@@ -0,0 +1,173 @@
+import os
+import threading
+import time
+from typing import Callable, Iterable, Iterator, Optional
+
+from components.shared.infrastructure.logger import logger
+from components.shared.infrastructure.tenant import set_current_tenant
+from components.summary.application import jobs
+from components.summary.application.providers import (
+    ProviderStreamError,
+    QueuePosition,
+)
+
+STREAM_QUEUE = "queue"
+STREAM_CHUNK = "chunk"
+STREAM_END = "end"
+STREAM_IDLE = "idle"
+
+
+class _LocalStream:
+    def __init__(self):
+        self.version = 0
+        self.condition = threading.Condition()
+
+    def touch(self) -> None:
+        with self.condition:
+            self.version += 1
+            self.condition.notify_all()
+
+
+class ResumableStreams:
+    """Buffers live summary streams so a dropped client can resume them.
+
+    Each stream is generated by a background pump, independent of the HTTP
+    connection, into a SummaryJobStore record kept for the retention window.
+    Readers follow the buffer from any offset; with the Redis store a
+    reconnect can land on any web process. Readers in the generating process
+    are woken per chunk, others poll.
+    """
+
+    def __init__(
+        self,
+        store: Optional[jobs.SummaryJobStore] = None,
+        poll_s: Optional[float] = None,
+    ):
+        self._store = store or jobs.build_summary_job_store(
+            ttl_s=float(os.getenv("SUMMARY_STREAM_RETENTION_S", "300"))
+        )
+        self._poll_s = poll_s or float(os.getenv("SUMMARY_JOB_POLL_S", "0.25"))
+        self._local: dict[str, _LocalStream] = {}
+        self._lock = threading.Lock()
+
+    def start(
+        self,
+        tenant: Optional[str],
+        document_id,
+        options: dict,
+        produce: Callable[[Callable[..., None]], Iterable],
+    ) -> dict:
+        """Start generating in the background.
+
+        ``produce`` receives a callback storing extra fields on the stream
+        record, e.g. what the summary is generated from.
+        """
+        stream = jobs.new_summary_job(tenant, document_id, options)
+        stream["status"] = jobs.JOB_RUNNING
+        self._store.create(stream)
+        local = _LocalStream()
+        with self._lock:
+            self._local[stream["job_id"]] = local
+        threading.Thread(
+            target=self._pump,
+            args=(stream["job_id"], tenant, produce, local),
+            daemon=True,
+        ).start()
+        return stream
+
+    def find(
+        self, stream_id: str, tenant: Optional[str], document_id
+    ) -> Optional[dict]:
+        stream = self._store.get(stream_id)
+        if (
+            not stream
+            or stream["tenant"] != tenant
+            or stream["document_id"] != str(document_id)
+        ):
+            return None
+        return stream
+
+    def follow(
+        self, stream_id: str, start: int = 0, idle_s: Optional[float] = None
+    ) -> Iterator[tuple]:
+        """Yield (STREAM_QUEUE, position), (STREAM_CHUNK, index, text), a
+        (STREAM_IDLE,) tick at least every ``idle_s`` while nothing arrives
+        and a final (STREAM_END, record) once the stream has finished."""
+        idle_s = idle_s or self._poll_s
+        index = start
+        last_position = None
+        refresh = True
+        last_read = 0.0
+        while True:
+            local = self._local.get(stream_id)
+            seen = local.version if local else None
+            if refresh or time.monotonic() - last_read >= self._poll_s:
+                last_read = time.monotonic()
+                current = self._store.get(stream_id) or {
+                    "status": jobs.JOB_ERROR,
+                    "error": "Summary stream expired",
+                    "error_type": "StreamExpired",
+                }
+                # Read chunks after the status so a finished stream is drained
+                chunks = self._store.read_chunks(stream_id, index)
+                position = current.get("queue_position")
+                if not chunks and index == 0 and position != last_position:
+                    if position:
+                        yield STREAM_QUEUE, position
+                    last_position = position
+                for text in chunks:
+                    yield STREAM_CHUNK, index, text
+                    index += 1
+                if current["status"] in jobs.FINISHED_STATUSES:
+                    yield STREAM_END, current
+                    return
+            else:
+                yield (STREAM_IDLE,)
+            if local is not None:
+                with local.condition:
+                    refresh = local.condition.wait_for(
+                        lambda: local.version != seen, timeout=idle_s
+                    )
+            else:
+                refresh = False
+                time.sleep(idle_s)
+
+    def _pump(
+        self,
+        stream_id: str,
+        tenant: Optional[str],
+        produce: Callable[[Callable[..., None]], Iterable],
+        local: _LocalStream,
+    ):
+        set_current_tenant(tenant)
+        try:
+            for chunk in produce(
+                lambda **fields: self._store.update(stream_id, **fields)
+            ):
+                if isinstance(chunk, QueuePosition):
+                    self._store.update(stream_id, queue_position=chunk.position)
+                else:
+                    self._store.append_chunk(stream_id, chunk)
+                local.touch()
+            self._store.update(stream_id, status=jobs.JOB_DONE, queue_position=None)
+        except ProviderStreamError as e:
+            self._fail(stream_id, e, "ProviderStreamError")
+        except Exception as e:
+            logger.exception(f"Summary stream {stream_id} failed: {e}")
+            self._fail(stream_id, e, e.__class__.__name__)
+        finally:
+            with self._lock:
+                self._local.pop(stream_id, None)
+            local.touch()
+
+    def _fail(self, stream_id: str, err: Exception, error_type: str) -> None:
+        self._store.update(
+            stream_id,
+            status=jobs.JOB_ERROR,
+            error=str(err),
+            error_type=error_type,
+            error_kind=getattr(err, "kind", None),
+        )
+
+
+summary_streams = ResumableStreams()
@@ -0,0 +1,282 @@
+import os
+import queue
+import threading
+import time
+from collections import deque
+from typing import Callable, Iterable, Optional
+
+from components.shared.infrastructure.logger import logger
+from components.shared.infrastructure.tenant import (
+    get_current_tenant,
+    set_current_tenant,
+)
+from components.summary.application import resilience
+from components.summary.application.limiter import (
+    ProviderLimiter,
+    provider_limiter,
+    request_tokens,
+)
+from components.summary.application.providers import SummaryProvider
+
+ERROR_DECAY = 0.8
+UNHEALTHY_ERROR_RATE = 0.5
+
+
+def _number_env(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, str(default)))
+    except ValueError:
+        return default
+
+
+class BackendStats:
+    """Rolling time-to-first-chunk samples and a decaying error rate per backend."""
+
+    def __init__(self, window: Optional[int] = None):
+        self._window = window or int(_number_env("LLM_ROUTE_STATS_WINDOW", 200))
+        self._latencies: dict[str, deque] = {}
+        self._errors: dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def record_first_chunk(self, backend: str, seconds: float) -> None:
+        with self._lock:
+            samples = self._latencies.setdefault(backend, deque(maxlen=self._window))
+            samples.append(seconds)
+
+    def record_success(self, backend: str) -> None:
+        with self._lock:
+            self._errors[backend] = self._errors.get(backend, 0.0) * ERROR_DECAY
+
+    def record_error(self, backend: str) -> None:
+        with self._lock:
+            rate = self._errors.get(backend, 0.0)
+            self._errors[backend] = rate * ERROR_DECAY + (1 - ERROR_DECAY)
+
+    def error_rate(self, backend: str) -> float:
+        return self._errors.get(backend, 0.0)
+
+    def quantile(self, backend: str, q: float) -> Optional[float]:
+        with self._lock:
+            samples = sorted(self._latencies.get(backend, ()))
+        if not samples:
+            return None
+        return samples[min(len(samples) - 1, int(q * len(samples)))]
+
+
+backend_stats = BackendStats()
+
+
+class RoutingProvider(SummaryProvider):
+    """Routes a summary to one of several backends, ranked by recent stats.
+
+    Backends are tried in order of health, then median time to first chunk,
+    then configuration order. A backend that fails before producing output
+    falls over to the next one. With hedging enabled, a second backend is
+    started when the first has produced nothing within its p95 time to first
+    chunk, provided the limiter has a spare slot for it; the first to emit
+    text wins and the other is cancelled through ``options["cancel"]``. A
+    loser blocked inside its SDK call stops as soon as it returns control.
+    """
+
+    def __init__(
+        self,
+        backends: list[tuple[str, SummaryProvider]],
+        stats: BackendStats = None,
+        hedge: Optional[bool] = None,
+        limiter: ProviderLimiter = None,
+    ):
+        self._backends = backends
+        self._stats = stats or backend_stats
+        self._limiter = limiter or provider_limiter
+        self._hedge = (
+            hedge
+            if hedge is not None
+            else os.getenv("LLM_HEDGE", "false").lower() in ("1", "true", "yes")
+        )
+        self._hedge_min_s = _number_env("LLM_HEDGE_MIN_S", 0.5)
+        self._hedge_max_s = _number_env("LLM_HEDGE_MAX_S", 8.0)
+
+    @property
+    def model_name(self) -> Optional[str]:
+        return "|".join(name for name, _ in self._backends)
+
+    def stream_summary(self, content_html: str, options: dict) -> Iterable[str]:
+        order = self._rank()
+        if self._hedge and len(order) > 1:
+            yield from self._stream_hedged(order, content_html, options)
+        else:
+            yield from self._stream_failover(order, content_html, options)
+
+    def _unhealthy(self, name: str, provider: SummaryProvider) -> bool:
+        if self._stats.error_rate(name) > UNHEALTHY_ERROR_RATE:
+            return True
+        provider_name = getattr(provider, "provider_name", None)
+        if provider_name is None:
+            return False
+        breaker = resilience.circuit_breakers.get(provider_name, provider.model_name)
+        return breaker.state == "open"
+
+    def _rank(self) -> list[tuple[str, SummaryProvider]]:
+        def key(item):
+            index, (name, provider) = item
+            median = self._stats.quantile(name, 0.5)
+            return (
+                self._unhealthy(name, provider),
+                median if median is not None else float("inf"),
+                index,
+            )
+
+        return [backend for _, backend in sorted(enumerate(self._backends), key=key)]
+
+    def _hedge_delay(self, name: str) -> float:
+        p95 = self._stats.quantile(name, 0.95)
+        if p95 is None:
+            return self._hedge_max_s
+        return min(self._hedge_max_s, max(self._hedge_min_s, p95))
+
+    def _stream_failover(
+        self, order: list, content_html: str, options: dict
+    ) -> Iterable[str]:
+        last_err: Optional[Exception] = None
+        for name, provider in order:
+            started = time.monotonic()
+            emitted = False
+            try:
+                for chunk in provider.stream_summary(content_html, options):
+                    if isinstance(chunk, str) and not emitted:
+                        self._stats.record_first_chunk(name, time.monotonic() - started)
+                        emitted = True
+                    yield chunk
+                self._stats.record_success(name)
+                return
+            except Exception as e:
+                self._stats.record_error(name)
+                if emitted:
+                    raise
+                logger.warning("summary_route_failover", extra={"backend": name})
+                last_err = e
+        raise last_err
+
+    def _pump(
+        self,
+        index: int,
+        backend: tuple[str, SummaryProvider],
+        content_html: str,
+        options: dict,
+        events: queue.Queue,
+        cancel: threading.Event,
+        tenant: Optional[str],
+        release: Optional[Callable[[], None]] = None,
+    ):
+        set_current_tenant(tenant)
+        name, provider = backend
+        started = time.monotonic()
+        emitted = False
+        stream = provider.stream_summary(content_html, dict(options, cancel=cancel))
+        try:
+            for chunk in stream:
+                if cancel.is_set():
+                    logger.info("summary_route_cancelled", extra={"backend": name})
+                    return
+                if isinstance(chunk, str) and not emitted:
+                    self._stats.record_first_chunk(name, time.monotonic() - started)
+                    emitted = True
+                events.put((index, "chunk", chunk))
+            self._stats.record_success(name)
+            events.put((index, "done", None))
+        except Exception as e:
+            if not cancel.is_set():
+                self._stats.record_error(name)
+            events.put((index, "error", e))
+        finally:
+            close = getattr(stream, "close", None)
+            if close:
+                close()
+            if release:
+                release()
+
+    def _stream_hedged(
+        self, order: list, content_html: str, options: dict
+    ) -> Iterable[str]:
+        events: queue.Queue = queue.Queue()
+        cancels: list[threading.Event] = []
+        running: set[int] = set()
+        tenant = get_current_tenant()
+        limiter_tenant = tenant or "unknown"
+
+        def launch(index: int, release: Optional[Callable[[], None]] = None) -> float:
+            cancel = threading.Event()
+            cancels.append(cancel)
+            running.add(index)
+            threading.Thread(
+                target=self._pump,
+                args=(index, order[index], content_html, options, events, cancel),
+                kwargs={"tenant": tenant, "release": release},
+                daemon=True,
+            ).start()
+            return time.monotonic() + self._hedge_delay(order[index][0])
+
+        deadline = launch(0)
+        launched = 1
+        hedge_allowed = True
+        winner: Optional[int] = None
+        last_err: Optional[Exception] = None
+        try:
+            while True:
+                timeout = None
+                # Hedge at most once: two backends in flight at a time
+                if (
+                    hedge_allowed
+                    and winner is None
+                    and len(running) == 1
+                    and launched < len(order)
+                ):
+                    timeout = max(0.0, deadline - time.monotonic())
+                try:
+                    index, kind, payload = events.get(timeout=timeout)
+                except queue.Empty:
+                    # The caller's limiter slot covers one backend call; the
+                    # hedge needs its own or it does not run
+                    if not self._limiter.try_acquire(
+                        limiter_tenant, request_tokens(content_html)
+                    ):
+                        logger.info(
+                            "summary_route_hedge_skipped",
+                            extra={"backend": order[launched][0]},
+                        )
+                        hedge_allowed = False
+                        continue
+                    logger.info(
+                        "summary_route_hedge", extra={"backend": order[launched][0]}
+                    )
+                    deadline = launch(
+                        launched, lambda: self._limiter.release(limiter_tenant)
+                    )
+                    launched += 1
+                    continue
+
+                if winner is not None and index != winner:
+                    continue
+                if kind == "chunk":
+                    if winner is None and isinstance(payload, str):
+                        winner = index
+                        for other, cancel in enumerate(cancels):
+                            if other != index:
+                                cancel.set()
+                    if winner == index or winner is None:
+                        yield payload
+                elif kind == "done":
+                    return
+                else:
+                    running.discard(index)
+                    if winner == index:
+                        raise payload
+                    last_err = payload
+                    if not running:
+                        if launched >= len(order):
+                            raise last_err
+                        deadline = launch(launched)
+                        launched += 1
+        finally:
+            for cancel in cancels:
+                cancel.set()
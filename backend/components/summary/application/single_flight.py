@@ -0,0 +1,137 @@
+import asyncio
+import threading
+from typing import AsyncIterable, AsyncIterator, Callable, Iterable, Iterator, Optional
+
+
+class _Flight:
+    def __init__(self):
+        self.chunks: list[str] = []
+        self.done = False
+        self.error: Optional[BaseException] = None
+        self.condition = threading.Condition()
+
+
+class StreamSingleFlight:
+    """Coalesces concurrent identical streams into one upstream generation.
+
+    The first caller for a key starts a background pump that drains the
+    upstream iterable into a shared buffer; every caller, including late
+    joiners, replays the buffer from the start and then follows new chunks.
+    The pump runs to completion even if all subscribers disconnect, so the
+    result still reaches any caching done by the upstream iterable.
+    """
+
+    def __init__(self, wait_timeout_s: float = 1.0):
+        self._flights: dict[str, _Flight] = {}
+        self._lock = threading.Lock()
+        self._wait_timeout_s = wait_timeout_s
+
+    def stream(self, key: str, start: Callable[[], Iterable[str]]) -> Iterator[str]:
+        with self._lock:
+            flight = self._flights.get(key)
+            if flight is None:
+                flight = _Flight()
+                self._flights[key] = flight
+                threading.Thread(
+                    target=self._pump, args=(key, flight, start), daemon=True
+                ).start()
+        return self._subscribe(flight)
+
+    def in_flight(self) -> int:
+        return len(self._flights)
+
+    def _pump(self, key: str, flight: _Flight, start: Callable[[], Iterable[str]]):
+        try:
+            for chunk in start():
+                with flight.condition:
+                    flight.chunks.append(chunk)
+                    flight.condition.notify_all()
+        except BaseException as e:
+            flight.error = e
+        finally:
+            with self._lock:
+                self._flights.pop(key, None)
+            with flight.condition:
+                flight.done = True
+                flight.condition.notify_all()
+
+    def _subscribe(self, flight: _Flight) -> Iterator[str]:
+        index = 0
+        while True:
+            with flight.condition:
+                while index >= len(flight.chunks) and not flight.done:
+                    flight.condition.wait(self._wait_timeout_s)
+                pending = flight.chunks[index:]
+                finished = flight.done
+            for chunk in pending:
+                yield chunk
+            index += len(pending)
+            if finished and index >= len(flight.chunks):
+                if flight.error is not None:
+                    raise flight.error
+                return
+
+
+class _AsyncFlight:
+    def __init__(self):
+        self.chunks: list = []
+        self.done = False
+        self.error: Optional[BaseException] = None
+        self.changed = asyncio.Event()
+
+
+class AsyncStreamSingleFlight:
+    """StreamSingleFlight for the asyncio path: the pump is a task on the
+    event loop instead of a thread. Flights are only shared within one loop.
+    """
+
+    def __init__(self):
+        self._flights: dict[str, _AsyncFlight] = {}
+        # The loop keeps only weak references to tasks
+        self._pumps: set[asyncio.Task] = set()
+
+    def stream(self, key: str, start: Callable[[], AsyncIterable]) -> AsyncIterator:
+        flight = self._flights.get(key)
+        if flight is None:
+            flight = _AsyncFlight()
+            self._flights[key] = flight
+            pump = asyncio.create_task(self._pump(key, flight, start))
+            self._pumps.add(pump)
+            pump.add_done_callback(self._pumps.discard)
+        return self._subscribe(flight)
+
+    def in_flight(self) -> int:
+        return len(self._flights)
+
+    async def _pump(
+        self, key: str, flight: _AsyncFlight, start: Callable[[], AsyncIterable]
+    ):
+        try:
+            async for chunk in start():
+                flight.chunks.append(chunk)
+                flight.changed.set()
+        except BaseException as e:
+            flight.error = e
+        finally:
+            self._flights.pop(key, None)
+            flight.done = True
+            flight.changed.set()
+
+    async def _subscribe(self, flight: _AsyncFlight) -> AsyncIterator:
+        index = 0
+        while True:
+            while index < len(flight.chunks):
+                yield flight.chunks[index]
+                index += 1
+            if flight.done:
+                if flight.error is not None:
+                    raise flight.error
+                return
+            # No await between the checks above and the wait, so a chunk
+            # cannot arrive unnoticed
+            flight.changed.clear()
+            await flight.changed.wait()
+
+
+summary_flights = StreamSingleFlight()
+async_summary_flights = AsyncStreamSingleFlight()
@@ -0,0 +1,139 @@
+import abc
+import hashlib
+import os
+import re
+import threading
+from collections import OrderedDict
+from typing import Callable, Iterable, Iterator, Optional
+
+from components.summary.application.prompts import (
+    DEFAULT_SUMMARY_INSTRUCTION,
+    PROMPT_VERSION,
+)
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_html(content_html: str) -> str:
+    return _WHITESPACE.sub(" ", content_html or "").strip()
+
+
+def content_hash(content_html: str) -> str:
+    return hashlib.sha256(normalize_html(content_html).encode("utf-8")).hexdigest()
+
+
+def summary_cache_key(
+    tenant: Optional[str],
+    content_html: str,
+    instruction: Optional[str],
+    model: Optional[str],
+    pipeline: Optional[str] = None,
+) -> str:
+    # pipeline: how the summary is produced (single pass or hierarchical), as
+    # both may run on the same content and produce different summaries
+    parts = [
+        tenant or "",
+        content_hash(content_html),
+        instruction or DEFAULT_SUMMARY_INSTRUCTION,
+        model or "",
+        pipeline or "",
+        PROMPT_VERSION,
+    ]
+    return hashlib.sha256("\x1f".join(parts).encode("utf-8")).hexdigest()
+
+
+class SummaryCache(abc.ABC):
+    @abc.abstractmethod
+    def get(self, key: str) -> Optional[str]:
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def set(self, key: str, summary_html: str, model: Optional[str] = None) -> None:
+        raise NotImplementedError
+
+
+class NullSummaryCache(SummaryCache):
+    def get(self, key: str) -> Optional[str]:
+        return None
+
+    def set(self, key: str, summary_html: str, model: Optional[str] = None) -> None:
+        return None
+
+
+class InMemorySummaryCache(SummaryCache):
+    def __init__(self, max_entries: Optional[int] = None):
+        self._max_entries = max_entries or int(
+            os.getenv("SUMMARY_CACHE_MAX_ENTRIES", "1024")
+        )
+        self._entries: "OrderedDict[str, str]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            summary_html = self._entries.get(key)
+            if summary_html is not None:
+                self._entries.move_to_end(key)
+            return summary_html
+
+    def set(self, key: str, summary_html: str, model: Optional[str] = None) -> None:
+        with self._lock:
+            self._entries[key] = summary_html
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+
+
+class TieredSummaryCache(SummaryCache):
+    """Reads through an in-process LRU before falling back to a shared backend."""
+
+    def __init__(self, local: SummaryCache, shared: SummaryCache):
+        self._local = local
+        self._shared = shared
+
+    def get(self, key: str) -> Optional[str]:
+        summary_html = self._local.get(key)
+        if summary_html is None:
+            summary_html = self._shared.get(key)
+            if summary_html is not None:
+                self._local.set(key, summary_html)
+        return summary_html
+
+    def set(self, key: str, summary_html: str, model: Optional[str] = None) -> None:
+        self._local.set(key, summary_html, model)
+        self._shared.set(key, summary_html, model)
+
+
+def replay_summary(summary_html: str, size: int = 512) -> Iterator[str]:
+    for i in range(0, len(summary_html), size):
+        yield summary_html[i : i + size]
+
+
+def record_summary(
+    stream: Iterable[str], on_complete: Callable[[str], None]
+) -> Iterator[str]:
+    # Only a stream that ran to completion is stored; errors and client
+    # disconnects leave the cache untouched.
+    chunks = []
+    for chunk in stream:
+        if isinstance(chunk, str):
+            chunks.append(chunk)
+        yield chunk
+    summary_html = "".join(chunks)
+    if summary_html:
+        on_complete(summary_html)
+
+
+def build_summary_cache(backend: Optional[str] = None) -> SummaryCache:
+    backend = (backend or os.getenv("SUMMARY_CACHE_BACKEND", "memory")).lower()
+    if backend == "none":
+        return NullSummaryCache()
+    if backend == "postgres":
+        from components.summary.infrastructure.summary_cache import (
+            PostgresSummaryCache,
+        )
+
+        return TieredSummaryCache(InMemorySummaryCache(), PostgresSummaryCache())
+    return InMemorySummaryCache()
+
+
+summary_cache = build_summary_cache()
@@ -1,10 +1,39 @@
+from typing import Callable, Optional
+
 from components.documents.application import errors as doc_errors
 from components.shared.application.base import UnitOfWorkInterface
 from components.shared.domain.base import LoggerInterface
-from components.summary.application.providers import get_provider
+from components.shared.infrastructure.tenant import (
+    get_current_tenant,
+    set_current_tenant,
+)
+from components.summary.application import hierarchical, incremental, jobs
+from components.summary.application.prompts import REVISE_SUMMARY_INSTRUCTION
+from components.summary.application.providers import QueuePosition, get_provider
+from components.summary.application.single_flight import summary_flights
+from components.summary.application.summary_cache import (
+    content_hash,
+    record_summary,
+    replay_summary,
+    summary_cache,
+    summary_cache_key,
+)
 from components.summary.domain import commands
 
 
+def _summary_source(document, source_hash: Optional[str]) -> tuple[str, Optional[str]]:
+    """Hash and HTML of the content a summary was generated from.
+
+    A summary generated from an earlier version keeps that version's hash, so
+    the next request sees the edit; with its HTML gone it regenerates instead
+    of revising. Without a hash the current content is assumed.
+    """
+    current = content_hash(document.content_html)
+    if source_hash is None or source_hash == current:
+        return current, document.content_html
+    return source_hash, None
+
+
 class SummaryService:
     @staticmethod
     def save_summary(
@@ -16,7 +45,10 @@ class SummaryService:
             document = uow.repositories.documents.get(command.document_id)
             if not document:
                 raise doc_errors.DocumentNotFound(command.document_id)
-            document.summary_html = command.content_html
+            document.set_summary(
+                command.content_html,
+                *_summary_source(document, command.source_hash),
+            )
             uow.repositories.documents.save(document)
             uow.commit()
             logger.info(f"Summary saved for document {document.id}")
@@ -32,7 +64,10 @@ class SummaryService:
             document = uow.repositories.documents.get(command.document_id)
             if not document:
                 raise doc_errors.DocumentNotFound(command.document_id)
-            document.summary_html = command.content_html
+            document.set_summary(
+                command.content_html,
+                *_summary_source(document, command.source_hash),
+            )
             uow.repositories.documents.save(document)
             uow.commit()
             logger.info(f"Summary updated for document {document.id}")
@@ -47,7 +82,7 @@ class SummaryService:
             document = uow.repositories.documents.get(command.document_id)
             if not document:
                 raise doc_errors.DocumentNotFound(command.document_id)
-            document.summary_html = None
+            document.clear_summary()
             uow.repositories.documents.save(document)
             uow.commit()
             logger.info(f"Summary deleted for document {document.id}")
@@ -58,12 +93,131 @@ class SummaryService:
         options: dict | None,
         uow: UnitOfWorkInterface,
         logger: LoggerInterface,
+        annotate: Optional[Callable[..., None]] = None,
     ):
         # Not a bus command (streaming), but uses same dependencies
+        content, options = SummaryService.prepare_generation(
+            document_id, options, uow, logger
+        )
+        if annotate:
+            annotate(source_hash=options["source_hash"])
+        return SummaryService.stream_content(document_id, content, options, logger)
+
+    @staticmethod
+    def prepare_generation(
+        document_id,
+        options: dict | None,
+        uow: UnitOfWorkInterface,
+        logger: LoggerInterface,
+    ) -> tuple[str, dict]:
+        """Content and options to send to the provider for this document.
+
+        ``options["source_hash"]`` identifies the document version read here;
+        saving the summary with it keeps later edits detectable.
+        """
         with uow:
             document = uow.repositories.documents.get(document_id)
             if not document:
                 raise doc_errors.DocumentNotFound(document_id)
             content = document.content_html
+            options = dict(options or {}, source_hash=content_hash(content))
+            revision = incremental.plan_revision(document, options)
+        if revision is None:
+            return content, options
+        # Small edit: ask for a revised summary instead of a full regeneration
+        logger.info(f"Incremental summary revision for document {document_id}")
+        return revision, dict(
+            options,
+            instruction=REVISE_SUMMARY_INSTRUCTION,
+            mode=hierarchical.MODE_SINGLE,
+        )
+
+    @staticmethod
+    def stream_content(
+        document_id, content: str, options: dict, logger: LoggerInterface
+    ):
         provider = get_provider()
-        return provider.stream_summary(content, options or {})
+        tenant = get_current_tenant()
+        use_hierarchical = hierarchical.use_hierarchical(content, options)
+        cache_key = summary_cache_key(
+            tenant,
+            content,
+            options.get("instruction"),
+            provider.model_name,
+            (
+                hierarchical.MODE_HIERARCHICAL
+                if use_hierarchical
+                else hierarchical.MODE_SINGLE
+            ),
+        )
+        if options.get("use_cache", True):
+            cached = summary_cache.get(cache_key)
+            if cached is not None:
+                logger.info(f"Summary cache hit for document {document_id}")
+                return replay_summary(cached)
+
+        def start():
+            # Runs on the single-flight pump thread, which has no tenant yet
+            set_current_tenant(tenant)
+            if use_hierarchical:
+                stream = hierarchical.stream_hierarchical_summary(
+                    provider, content, options, tenant
+                )
+            else:
+                stream = provider.stream_summary(content, options)
+            return record_summary(
+                stream,
+                lambda summary_html: summary_cache.set(
+                    cache_key, summary_html, provider.model_name
+                ),
+            )
+
+        return summary_flights.stream(cache_key, start)
+
+    @staticmethod
+    def run_summary_job(
+        job_id: str,
+        document_id,
+        options: dict | None,
+        uow: UnitOfWorkInterface,
+        logger: LoggerInterface,
+        job_store: jobs.SummaryJobStore = jobs.summary_job_store,
+    ):
+        # Generates outside the web request: chunks go to the shared job buffer
+        # for SSE tailing and the final summary is persisted on the document.
+        job_store.update(job_id, status=jobs.JOB_RUNNING)
+        try:
+            chunks = []
+            source = {}
+            for chunk in SummaryService.generate_stream(
+                document_id, options, uow, logger, source.update
+            ):
+                if isinstance(chunk, QueuePosition):
+                    job_store.update(job_id, queue_position=chunk.position)
+                    continue
+                chunks.append(chunk)
+                job_store.append_chunk(job_id, chunk)
+
+            summary_html = "".join(chunks)
+            if summary_html:
+                SummaryService.save_summary(
+                    commands.SaveSummary(
+                        document_id=document_id,
+                        content_html=summary_html,
+                        source_hash=source["source_hash"],
+                    ),
+                    uow,
+                    logger,
+                )
+            job_store.update(
+                job_id, status=jobs.JOB_DONE, source_hash=source["source_hash"]
+            )
+            logger.info(f"Summary job {job_id} done for document {document_id}")
+        except Exception as e:
+            logger.exception(f"Summary job {job_id} failed: {e}")
+            job_store.update(
+                job_id,
+                status=jobs.JOB_ERROR,
+                error=str(e),
+                error_type=e.__class__.__name__,
+            )
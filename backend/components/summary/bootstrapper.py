@@ -1,12 +1,15 @@
-import inspect
 from typing import Callable, Union
 
 from components.documents.infrastructure import repositories as doc_repositories
 from components.shared.application.base import UnitOfWorkInterface
+from components.shared.application.bootstrap import CompiledHandlers
 from components.shared.application.message_bus import MessageBus
 from components.shared.domain.base import LoggerInterface
 from components.shared.infrastructure.logger import logger as default_logger
-from components.shared.infrastructure.sqlalchemy_base import SqlAlchemyUnitOfWork
+from components.shared.infrastructure.sqlalchemy_base import (
+    SqlAlchemyReadOnlyUnitOfWork,
+    SqlAlchemyUnitOfWork,
+)
 from components.summary.application.handler_maps import (
     COMMAND_HANDLER_MAPS,
     EVENT_HANDLER_MAPS,
@@ -18,12 +21,24 @@ def default_uow_factory() -> SqlAlchemyUnitOfWork:
     return SqlAlchemyUnitOfWork(documents=doc_repositories.DocumentRepository)
 
 
+def default_read_only_uow_factory() -> SqlAlchemyReadOnlyUnitOfWork:
+    return SqlAlchemyReadOnlyUnitOfWork(documents=doc_repositories.DocumentRepository)
+
+
+# Signatures are resolved once at import; each bus only binds its own uow
+HANDLERS = CompiledHandlers(COMMAND_HANDLER_MAPS, EVENT_HANDLER_MAPS)
+
+
 class Bootstrapper:
     bus: MessageBus
 
     def bootstrap_factory(self) -> Callable[[], MessageBus]:
         return lambda: self.bootstrap()
 
+    def read_only_uow_factory(self) -> Callable[[], UnitOfWorkInterface]:
+        # Queries skip the bus, so they only need a unit of work
+        return default_read_only_uow_factory
+
     def bootstrap(
         self,
         uow_factory: Union[
@@ -32,36 +47,12 @@ class Bootstrapper:
         logger: LoggerInterface = default_logger,
     ) -> MessageBus:
         uow = uow_factory() if callable(uow_factory) else uow_factory
-        dependencies = dict(
-            uow=uow,
-            logger=logger,
-        )
-
-        injected_event_handlers = {
-            event_type: [
-                self._get_inject_dependencies(handler, dependencies)
-                for handler in event_handlers
-            ]
-            for event_type, event_handlers in EVENT_HANDLER_MAPS.items()
-        }
-        injected_command_handlers = {
-            command_type: self._get_inject_dependencies(handler, dependencies)
-            for command_type, handler in COMMAND_HANDLER_MAPS.items()
-        }
+        command_handlers, event_handlers = HANDLERS.bind(dict(uow=uow, logger=logger))
         self.bus = MessageBus(
             uow=uow,
-            event_handlers=injected_event_handlers,
-            command_handlers=injected_command_handlers,
+            event_handlers=event_handlers,
+            command_handlers=command_handlers,
             logger=logger,
         )
 
         return self.bus
-
-    def _get_inject_dependencies(self, handler, dependencies):
-        params = inspect.signature(handler).parameters
-        deps = {
-            name: dependency
-            for name, dependency in dependencies.items()
-            if name in params
-        }
-        return lambda message: handler(message, **deps)
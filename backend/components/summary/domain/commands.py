@@ -1,4 +1,5 @@
 import uuid
+from typing import Optional
 
 from pydantic import constr
 
@@ -8,11 +9,14 @@ from components.shared.domain.base import Command
 class SaveSummary(Command):
     document_id: uuid.UUID
     content_html: constr(min_length=1, max_length=100000)
+    # Hash of the document content the summary was generated from
+    source_hash: Optional[constr(min_length=64, max_length=64)] = None
 
 
 class UpdateSummary(Command):
     document_id: uuid.UUID
     content_html: constr(min_length=1, max_length=100000)
+    source_hash: Optional[constr(min_length=64, max_length=64)] = None
 
 
 class DeleteSummary(Command):
@@ -0,0 +1,48 @@
+import json
+import os
+from typing import Optional
+
+import redis
+
+from components.summary.application.jobs import SummaryJobStore
+
+
+class RedisSummaryJobStore(SummaryJobStore):
+    """Job store shared by web processes and Celery workers through Redis."""
+
+    def __init__(self, url: str, ttl_s: Optional[int] = None):
+        self._redis = redis.Redis.from_url(url, decode_responses=True)
+        self._ttl_s = ttl_s or int(os.getenv("SUMMARY_JOB_TTL_S", "3600"))
+
+    @staticmethod
+    def _job_key(job_id: str) -> str:
+        return f"summary_job:{job_id}"
+
+    @staticmethod
+    def _chunks_key(job_id: str) -> str:
+        return f"summary_job:{job_id}:chunks"
+
+    def create(self, job: dict) -> None:
+        self._redis.set(self._job_key(job["job_id"]), json.dumps(job), ex=self._ttl_s)
+
+    def get(self, job_id: str) -> Optional[dict]:
+        raw = self._redis.get(self._job_key(job_id))
+        return json.loads(raw) if raw else None
+
+    def update(self, job_id: str, **fields) -> None:
+        # Only the worker running the job writes to it, so read-modify-write is safe
+        job = self.get(job_id)
+        if job is None:
+            return
+        job.update(fields)
+        self._redis.set(self._job_key(job_id), json.dumps(job), ex=self._ttl_s)
+
+    def append_chunk(self, job_id: str, text: str) -> None:
+        key = self._chunks_key(job_id)
+        pipeline = self._redis.pipeline()
+        pipeline.rpush(key, text)
+        pipeline.expire(key, self._ttl_s)
+        pipeline.execute()
+
+    def read_chunks(self, job_id: str, start: int = 0) -> list[str]:
+        return self._redis.lrange(self._chunks_key(job_id), start, -1)
@@ -0,0 +1,82 @@
+import time
+import uuid
+from typing import Optional
+
+import redis
+
+from components.summary.application.limiter import LimiterStore
+
+# Each held slot is a lease (a member of a sorted set scored by its expiry),
+# so a worker that dies mid-call leaks only its own slots, and only until
+# they expire
+SLOT_TTL_S = 600
+
+_ACQUIRE_SLOT = """
+local now = tonumber(ARGV[2])
+redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', now)
+if redis.call('ZCARD', KEYS[1]) >= tonumber(ARGV[1]) then
+  return 0
+end
+redis.call('ZADD', KEYS[1], now + tonumber(ARGV[3]), ARGV[4])
+-- Idle sets go away once the newest lease has expired
+redis.call('EXPIRE', KEYS[1], ARGV[3])
+return 1
+"""
+
+_RELEASE_SLOT = """
+redis.call('ZREM', KEYS[1], ARGV[1])
+return 1
+"""
+
+_TAKE_TOKENS = """
+local amount = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local capacity = tonumber(ARGV[3])
+local now = tonumber(ARGV[4])
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'updated_at')
+local tokens = tonumber(state[1]) or capacity
+local updated_at = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + (now - updated_at) * rate)
+local granted = 0
+if amount <= tokens then
+  tokens = math.min(capacity, tokens - amount)
+  granted = 1
+end
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'updated_at', now)
+redis.call('EXPIRE', KEYS[1], math.ceil(capacity / math.max(rate, 0.001)) + 60)
+return granted
+"""
+
+
+class RedisLimiterStore(LimiterStore):
+    """Limiter counters shared by every worker through Redis (atomic Lua scripts)."""
+
+    def __init__(self, url: str, prefix: str = "llm_limiter"):
+        self._redis = redis.Redis.from_url(url)
+        self._prefix = prefix
+        self._acquire_slot = self._redis.register_script(_ACQUIRE_SLOT)
+        self._release_slot = self._redis.register_script(_RELEASE_SLOT)
+        self._take_tokens = self._redis.register_script(_TAKE_TOKENS)
+
+    def _key(self, key: str) -> str:
+        return f"{self._prefix}:{key}"
+
+    def acquire_slot(self, key: str, limit: int) -> Optional[str]:
+        lease = uuid.uuid4().hex
+        granted = self._acquire_slot(
+            keys=[self._key(key)], args=[limit, time.time(), SLOT_TTL_S, lease]
+        )
+        return lease if granted else None
+
+    def release_slot(self, key: str, lease: str) -> None:
+        self._release_slot(keys=[self._key(key)], args=[lease])
+
+    def take_tokens(
+        self, key: str, amount: float, rate_per_s: float, capacity: float
+    ) -> bool:
+        return bool(
+            self._take_tokens(
+                keys=[self._key(key)],
+                args=[amount, rate_per_s, capacity, time.time()],
+            )
+        )
@@ -0,0 +1,13 @@
+from sqlalchemy import Column, DateTime, MetaData, String, Table, Text
+
+metadata = MetaData()
+
+
+summary_cache_table = Table(
+    "summary_cache",
+    metadata,
+    Column("key", String(length=64), primary_key=True, nullable=False),
+    Column("summary_html", Text, nullable=False),
+    Column("model", String(length=255), nullable=True),
+    Column("created_at", DateTime, nullable=False),
+)
@@ -0,0 +1,57 @@
+from datetime import UTC, datetime
+from typing import Callable, Optional
+
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from components.shared.infrastructure.db import DEFAULT_SESSION_MAKER
+from components.shared.infrastructure.logger import logger
+from components.summary.application.summary_cache import SummaryCache
+from components.summary.infrastructure.orm import summary_cache_table
+
+
+class PostgresSummaryCache(SummaryCache):
+    """Summary cache shared by every worker, stored in the tenant database."""
+
+    def __init__(self, session_factory: Callable[[], Session] = DEFAULT_SESSION_MAKER):
+        self._session_factory = session_factory
+
+    def get(self, key: str) -> Optional[str]:
+        session = self._session_factory()
+        try:
+            return session.execute(
+                select(summary_cache_table.c.summary_html).where(
+                    summary_cache_table.c.key == key
+                )
+            ).scalar_one_or_none()
+        except Exception:
+            logger.exception("summary_cache_read_error")
+            return None
+        finally:
+            session.close()
+
+    def set(self, key: str, summary_html: str, model: Optional[str] = None) -> None:
+        statement = insert(summary_cache_table).values(
+            key=key,
+            summary_html=summary_html,
+            model=model,
+            created_at=datetime.now(UTC),
+        )
+        statement = statement.on_conflict_do_update(
+            index_elements=[summary_cache_table.c.key],
+            set_={
+                "summary_html": statement.excluded.summary_html,
+                "model": statement.excluded.model,
+                "created_at": statement.excluded.created_at,
+            },
+        )
+        session = self._session_factory()
+        try:
+            session.execute(statement)
+            session.commit()
+        except Exception:
+            session.rollback()
+            logger.exception("summary_cache_write_error")
+        finally:
+            session.close()
@@ -0,0 +1,258 @@
+"""ASGI entry for summary streaming.
+
+Serves the same SSE contract as ``POST /api/documents/<id>/summary/stream`` on
+the Flask app, but on an event loop: an open stream waiting on the provider
+holds no worker thread, so a few processes can keep thousands of streams
+open. Only the stream route is served here; route it to this app in the proxy
+and keep everything else on the Flask app.
+
+Streams here cannot be resumed: chunks carry no event ids and a generation
+ends with its connection, so a request with ``Last-Event-ID`` is rejected
+rather than silently starting over.
+"""
+
+import asyncio
+import json
+import re
+from typing import AsyncIterator, Callable, Optional
+from uuid import UUID, uuid4
+
+from components.shared.infrastructure.errors import NoConfigForTenant
+from components.shared.infrastructure.logger import logger
+from components.summary.application.async_summary import generate_stream_async
+from components.summary.application.providers import (
+    ProviderStreamError,
+    QueuePosition,
+)
+from components.summary.user_interface.bus import bus_factory
+from components.summary.user_interface.http.sse import (
+    EVENT_DONE,
+    EVENT_ERROR,
+    EVENT_OPEN,
+    EVENT_QUEUE,
+    SSE_HEADERS,
+    SseWriter,
+)
+from components.summary.user_interface.http.summary_api import (
+    NO_TENANT_CONFIG_MESSAGE,
+    _map_provider_error_message,
+    _stream_timeout_s,
+)
+
+RESUME_UNSUPPORTED_MESSAGE = (
+    "Resuming summary streams (Last-Event-ID) is not supported by this server. "
+    "Start a new stream without it."
+)
+STREAM_PATH = re.compile(
+    r"/api/documents/(?P<document_id>[0-9a-fA-F-]{32,36})/summary/stream/?"
+)
+
+
+async def _with_ticks(stream: AsyncIterator, idle_s: Callable[[], float]):
+    """Relay ``stream`` items; yield None each time ``idle_s`` passes without one."""
+    items: asyncio.Queue = asyncio.Queue(maxsize=64)
+    done = object()
+
+    async def pump():
+        try:
+            async for item in stream:
+                await items.put(item)
+            await items.put(done)
+        except Exception as e:
+            await items.put(e)
+
+    task = asyncio.create_task(pump())
+    try:
+        while True:
+            try:
+                item = await asyncio.wait_for(items.get(), idle_s())
+            except asyncio.TimeoutError:
+                yield None
+                continue
+            if item is done:
+                return
+            if isinstance(item, Exception):
+                raise item
+            yield item
+    finally:
+        task.cancel()
+
+
+async def summary_event_stream(
+    document_id: UUID, options: dict, tenant: str, req_id: str
+) -> AsyncIterator[str]:
+    bus = bus_factory()
+    log_extra = {"document_id": str(document_id), "request_id": req_id}
+    bus.logger.info("summary_stream_start", extra=log_extra)
+    writer = SseWriter(_stream_timeout_s(options))
+    source: dict = {}
+
+    yield writer.event(
+        EVENT_OPEN, {"document_id": str(document_id), "request_id": req_id}
+    )
+    try:
+        idx = 0
+        stream = generate_stream_async(
+            document_id, options, bus.uow, bus.logger, tenant, source.update
+        )
+        async for chunk in _with_ticks(stream, lambda: writer.idle_s):
+            if writer.expired:
+                yield writer.event(EVENT_ERROR, {"message": "stream timeout"})
+                bus.logger.warning("summary_stream_timeout", extra=log_extra)
+                return
+            if chunk is None:
+                frame = writer.tick()
+            elif isinstance(chunk, QueuePosition):
+                frame = writer.event(EVENT_QUEUE, {"position": chunk.position})
+            else:
+                frame = writer.chunk(chunk, idx)
+                idx += 1
+            if frame:
+                yield frame
+        yield writer.event(EVENT_DONE, {"source_hash": source.get("source_hash")})
+        bus.logger.info("summary_stream_done", extra=log_extra)
+    except NoConfigForTenant as e:
+        bus.logger.warning(
+            "summary_stream_no_tenant_config", extra=dict(log_extra, error=str(e))
+        )
+        yield writer.event(EVENT_ERROR, {"message": NO_TENANT_CONFIG_MESSAGE})
+    except ProviderStreamError as e:
+        bus.logger.error(
+            "summary_stream_provider_error", extra=dict(log_extra, error=str(e))
+        )
+        yield writer.event(EVENT_ERROR, {"message": _map_provider_error_message(e)})
+    except Exception:
+        bus.logger.exception("summary_stream_unhandled_error", extra=log_extra)
+        yield writer.event(
+            EVENT_ERROR, {"message": "Unexpected error. Please try again."}
+        )
+
+
+async def _read_body(receive) -> bytes:
+    body = b""
+    while True:
+        message = await receive()
+        body += message.get("body", b"")
+        if not message.get("more_body"):
+            return body
+
+
+async def _watch_disconnect(receive, disconnected: asyncio.Event) -> None:
+    while True:
+        message = await receive()
+        if message["type"] == "http.disconnect":
+            disconnected.set()
+            return
+
+
+def _cors_headers(headers: dict, preflight: bool = False) -> list[tuple]:
+    # Same policy as flask-cors on the Flask app: any origin, 1h preflight cache
+    if "origin" not in headers:
+        return []
+    cors = [(b"access-control-allow-origin", b"*")]
+    if preflight:
+        cors.append((b"access-control-allow-methods", b"POST, OPTIONS"))
+        requested = headers.get("access-control-request-headers")
+        if requested:
+            cors.append((b"access-control-allow-headers", requested.encode("latin-1")))
+        cors.append((b"access-control-max-age", b"3600"))
+    return cors
+
+
+async def _respond(
+    send, status: int, payload: Optional[dict] = None, headers: list = ()
+) -> None:
+    body = json.dumps(payload).encode() if payload is not None else b""
+    await send(
+        {
+            "type": "http.response.start",
+            "status": status,
+            "headers": [(b"content-type", b"application/json"), *headers],
+        }
+    )
+    await send({"type": "http.response.body", "body": body})
+
+
+async def _lifespan(receive, send) -> None:
+    while True:
+        message = await receive()
+        if message["type"] == "lifespan.startup":
+            await send({"type": "lifespan.startup.complete"})
+        elif message["type"] == "lifespan.shutdown":
+            await send({"type": "lifespan.shutdown.complete"})
+            return
+
+
+async def app(scope, receive, send):
+    if scope["type"] == "lifespan":
+        await _lifespan(receive, send)
+        return
+    if scope["type"] != "http":
+        return
+
+    headers = {
+        name.decode("latin-1").lower(): value.decode("latin-1")
+        for name, value in scope["headers"]
+    }
+    cors = _cors_headers(headers)
+    match = STREAM_PATH.fullmatch(scope["path"])
+    if not match:
+        await _respond(send, 404, {"message": "Not Found"}, cors)
+        return
+    if scope["method"] == "OPTIONS":
+        await _respond(send, 200, headers=_cors_headers(headers, preflight=True))
+        return
+    if scope["method"] != "POST":
+        await _respond(send, 405, {"message": "Method Not Allowed"}, cors)
+        return
+    try:
+        document_id = UUID(match.group("document_id"))
+    except ValueError:
+        await _respond(send, 404, {"message": "Not Found"}, cors)
+        return
+
+    tenant = headers.get("x-updraft-tenant") or headers.get("host")
+    if not tenant:
+        logger.warning("Missing tenant config")
+        await _respond(send, 403, headers=cors)
+        return
+    req_id = headers.get("x-request-id") or str(uuid4())
+
+    try:
+        options = json.loads(await _read_body(receive) or b"{}")
+    except ValueError:
+        options = {}
+    if not isinstance(options, dict):
+        options = {}
+    if headers.get("last-event-id") or options.get("last_event_id"):
+        await _respond(send, 400, {"message": RESUME_UNSUPPORTED_MESSAGE}, cors)
+        return
+
+    response_headers = [
+        (name.lower().encode("latin-1"), value.encode("latin-1"))
+        for name, value in SSE_HEADERS.items()
+    ]
+    response_headers.append((b"x-request-id", req_id.encode("latin-1")))
+    response_headers.extend(cors)
+    await send(
+        {"type": "http.response.start", "status": 200, "headers": response_headers}
+    )
+
+    disconnected = asyncio.Event()
+    watcher = asyncio.create_task(_watch_disconnect(receive, disconnected))
+    events = summary_event_stream(document_id, options, tenant, req_id)
+    try:
+        async for event in events:
+            if disconnected.is_set():
+                return
+            await send(
+                {
+                    "type": "http.response.body",
+                    "body": event.encode("utf-8"),
+                    "more_body": True,
+                }
+            )
+        await send({"type": "http.response.body", "body": b""})
+    finally:
+        watcher.cancel()
+        await events.aclose()
@@ -1,8 +1,11 @@
+from typing import Optional
+
 from pydantic import BaseModel
 
 
 class SaveSummaryRequest(BaseModel):
     content_html: str
+    source_hash: Optional[str] = None
 
 
 class UpdateSummaryRequest(SaveSummaryRequest):
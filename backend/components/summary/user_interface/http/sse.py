@@ -0,0 +1,129 @@
+import json
+import os
+import time
+from typing import Callable, Optional
+
+DATA_PREFIX = "data: "
+EVENT_OPEN = "event: open\n"
+EVENT_CHUNK = "event: chunk\n"
+EVENT_DONE = "event: done\n"
+EVENT_ERROR = "event: error\n"
+EVENT_QUEUE = "event: queue\n"
+HEARTBEAT = ": keep-alive\n\n"
+
+SSE_HEADERS = {
+    "Cache-Control": "no-cache",
+    "Connection": "keep-alive",
+    "Content-Type": "text/event-stream",
+    "X-Accel-Buffering": "no",
+}
+
+
+def _number_env(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, str(default)))
+    except ValueError:
+        return default
+
+
+def sse_event(event: str, data: dict, event_id: Optional[str] = None) -> str:
+    frame = f"id: {event_id}\n" if event_id else ""
+    return frame + event + DATA_PREFIX + json.dumps(data) + "\n\n"
+
+
+class SseWriter:
+    """Frames summary stream items as SSE, one string per write.
+
+    Text chunks are held until ``coalesce_chars`` are pending or the oldest
+    has waited ``coalesce_s``, then sent as one ``chunk`` event. A comment is
+    sent when nothing was written for ``heartbeat_s`` (0 disables) so proxies
+    keep the connection open and dead clients are detected, and ``expired``
+    turns true ``timeout_s`` after the stream started whether or not chunks
+    arrive. The stream source must call ``tick`` at least every ``idle_s``.
+    """
+
+    def __init__(
+        self,
+        timeout_s: float,
+        heartbeat_s: Optional[float] = None,
+        coalesce_chars: Optional[int] = None,
+        coalesce_s: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self._clock = clock
+        self._deadline = clock() + timeout_s
+        self._heartbeat_s = (
+            heartbeat_s
+            if heartbeat_s is not None
+            else _number_env("SSE_HEARTBEAT_S", 15)
+        )
+        self._coalesce_chars = (
+            coalesce_chars
+            if coalesce_chars is not None
+            else int(_number_env("SSE_COALESCE_CHARS", 64))
+        )
+        self._coalesce_s = (
+            coalesce_s
+            if coalesce_s is not None
+            else _number_env("SSE_COALESCE_MS", 50) / 1000
+        )
+        self._last_write = clock()
+        self._pending: list[str] = []
+        self._pending_chars = 0
+        self._pending_index = 0
+        self._pending_id: Optional[str] = None
+        self._pending_since = 0.0
+
+    @property
+    def expired(self) -> bool:
+        return self._clock() >= self._deadline
+
+    @property
+    def idle_s(self) -> float:
+        # Bounds how late a timeout, heartbeat or held chunk can be noticed
+        waits = [1.0, self._deadline - self._clock()]
+        if self._heartbeat_s:
+            waits.append(self._heartbeat_s)
+        if self._coalesce_chars:
+            waits.append(self._coalesce_s)
+        return max(0.01, min(waits))
+
+    def event(self, event: str, data: dict, event_id: Optional[str] = None) -> str:
+        return self.flush() + self._write(sse_event(event, data, event_id))
+
+    def chunk(self, text: str, index: int, event_id: Optional[str] = None) -> str:
+        if not self._pending:
+            self._pending_index = index
+            self._pending_since = self._clock()
+        self._pending.append(text)
+        self._pending_chars += len(text)
+        self._pending_id = event_id
+        if self._pending_chars >= self._coalesce_chars or self._pending_overdue():
+            return self.flush()
+        return ""
+
+    def tick(self) -> str:
+        if self._pending and self._pending_overdue():
+            return self.flush()
+        if self._heartbeat_s and self._clock() - self._last_write >= self._heartbeat_s:
+            return self._write(HEARTBEAT)
+        return ""
+
+    def flush(self) -> str:
+        if not self._pending:
+            return ""
+        frame = sse_event(
+            EVENT_CHUNK,
+            {"text": "".join(self._pending), "index": self._pending_index},
+            self._pending_id,
+        )
+        self._pending = []
+        self._pending_chars = 0
+        return self._write(frame)
+
+    def _pending_overdue(self) -> bool:
+        return self._clock() - self._pending_since >= self._coalesce_s
+
+    def _write(self, frame: str) -> str:
+        self._last_write = self._clock()
+        return frame
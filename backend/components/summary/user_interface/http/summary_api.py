@@ -1,144 +1,258 @@
-import json
 import os
 import time
+from typing import Optional
 from uuid import UUID
 
 from flask import Blueprint, Response, g, jsonify, request, stream_with_context
 
-from components.shared.infrastructure.errors import NoConfigForTenant
+from components.shared.infrastructure.tenant import get_current_tenant
 from components.shared.user_interface.utils import parse_with_for_http
+from components.summary.application import jobs, resilience
+from components.summary.application.errors import SummaryJobNotFound
 from components.summary.application.providers import ProviderStreamError
+from components.summary.application.resumable import (
+    STREAM_CHUNK,
+    STREAM_END,
+    STREAM_QUEUE,
+    summary_streams,
+)
 from components.summary.application.summary_service import SummaryService
 from components.summary.domain import commands
-from components.summary.user_interface.bus import bus_factory
+from components.summary.user_interface import tasks
+from components.summary.user_interface.bus import bus_factory, read_only_uow_factory
 from components.summary.user_interface.http import schemas
+from components.summary.user_interface.http.sse import (
+    EVENT_DONE,
+    EVENT_ERROR,
+    EVENT_OPEN,
+    EVENT_QUEUE,
+    SSE_HEADERS,
+    SseWriter,
+)
 
 summary_blueprint = Blueprint("summary", __name__, url_prefix="/api/documents")
-DATA_PREFIX = "data: "
-EVENT_OPEN = "event: open\n"
-EVENT_CHUNK = "event: chunk\n"
-EVENT_DONE = "event: done\n"
-EVENT_ERROR = "event: error\n"
+NO_TENANT_CONFIG_MESSAGE = (
+    "Tenant not configured for AI provider. Set GEMINI_API_KEY or tenant secrets."
+)
 
 
 def _map_provider_error_message(err: Exception) -> str:
-    msg = str(err) if err else ""
-    low = msg.lower()
-    if any(
-        k in low
-        for k in ["api key", "permission", "unauthorized", "forbidden", "invalid key"]
-    ):
+    kind = getattr(err, "kind", None) or resilience.classify_error(err)
+    if kind == resilience.ERROR_AUTH:
         return "Provider authentication or permission error. Check API key and tenant configuration."
-    if any(k in low for k in ["quota", "rate", "429", "resourceexhausted", "exceeded"]):
+    if kind == resilience.ERROR_QUOTA:
         return "Provider is rate limited or quota exceeded. Please retry shortly."
-    if any(k in low for k in ["timeout", "deadline", "unavailable", "temporarily"]):
+    if kind == resilience.ERROR_TRANSIENT:
         return "Provider temporarily unavailable. Please retry."
     return "Summarization failed. Please try again."
 
 
-@summary_blueprint.post("/<uuid:document_id>/summary/stream")
-def stream_summary(document_id: UUID):
-    options = request.get_json(silent=True) or {}
-    bus = bus_factory()
-    req_id = getattr(g, "request_id", None)
-    bus.logger.info(
-        "summary_stream_start",
-        extra={"document_id": str(document_id), "request_id": req_id},
-    )
-
-    start_time = time.time()
+def _stream_timeout_s(options: dict) -> int:
     try:
         timeout_default = int(os.getenv("LLM_STREAM_TIMEOUT_S", "120"))
     except (ValueError, TypeError):
         timeout_default = 120
     opt_timeout = options.get("timeout_s")
     try:
-        timeout_s = int(opt_timeout) if opt_timeout is not None else timeout_default
+        return int(opt_timeout) if opt_timeout is not None else timeout_default
     except (ValueError, TypeError):
-        timeout_s = timeout_default
+        return timeout_default
+
+
+def _event_id(stream_id: str, delivered: int) -> str:
+    # Chunks delivered so far: a reconnect resumes with the next one
+    return f"{stream_id}:{delivered}"
+
+
+def _resume_point(last_event_id: Optional[str], document_id: UUID):
+    stream_id, _, delivered = (last_event_id or "").partition(":")
+    try:
+        start = int(delivered)
+    except ValueError:
+        return None
+    stream = summary_streams.find(stream_id, get_current_tenant(), document_id)
+    if stream is None or start < 0:
+        return None
+    return stream, start
+
+
+@summary_blueprint.post("/<uuid:document_id>/summary/stream")
+def stream_summary(document_id: UUID):
+    options = request.get_json(silent=True) or {}
+    bus = bus_factory()
+    req_id = getattr(g, "request_id", None)
+    log_extra = {"document_id": str(document_id), "request_id": req_id}
+
+    # Generation runs on a background pump and is buffered for
+    # SUMMARY_STREAM_RETENTION_S, so a reconnect carrying Last-Event-ID picks
+    # up after the last chunk it saw instead of calling the provider again.
+    resumed = _resume_point(
+        request.headers.get("Last-Event-ID") or options.get("last_event_id"),
+        document_id,
+    )
+    if resumed:
+        stream, start = resumed
+        bus.logger.info("summary_stream_resume", extra=dict(log_extra, delivered=start))
+    else:
+        bus.logger.info("summary_stream_start", extra=log_extra)
+        start = 0
+        stream = summary_streams.start(
+            get_current_tenant(),
+            document_id,
+            options,
+            lambda annotate: SummaryService.generate_stream(
+                document_id, options, bus.uow, bus.logger, annotate
+            ),
+        )
+    stream_id = stream["job_id"]
+
+    writer = SseWriter(_stream_timeout_s(options))
 
     def event_stream():
-        yield EVENT_OPEN
-        yield DATA_PREFIX + json.dumps(
-            {"document_id": str(document_id), "request_id": req_id}
-        ) + "\n\n"
-        try:
-            provider_stream = SummaryService.generate_stream(
-                document_id, options, bus.uow, bus.logger
-            )
-            for idx, chunk in enumerate(provider_stream):
-                if (time.time() - start_time) > timeout_s:
-                    yield EVENT_ERROR
-                    yield DATA_PREFIX + json.dumps(
-                        {"message": "stream timeout"}
-                    ) + "\n\n"
-                    bus.logger.warning(
-                        "summary_stream_timeout",
-                        extra={"document_id": str(document_id), "request_id": req_id},
-                    )
-                    return
-                payload = {"text": chunk, "index": idx}
-                yield EVENT_CHUNK
-                yield DATA_PREFIX + json.dumps(payload) + "\n\n"
-            yield EVENT_DONE
-            yield DATA_PREFIX + "{}\n\n"
-            bus.logger.info(
-                "summary_stream_done",
-                extra={"document_id": str(document_id), "request_id": req_id},
-            )
-        except NoConfigForTenant as e:
-            bus.logger.warning(
-                "summary_stream_no_tenant_config",
-                extra={
-                    "document_id": str(document_id),
-                    "request_id": req_id,
-                    "error": str(e),
-                },
-            )
-            yield EVENT_ERROR
-            yield DATA_PREFIX + json.dumps(
-                {
-                    "message": "Tenant not configured for AI provider. Set GEMINI_API_KEY or tenant secrets."
-                }
-            ) + "\n\n"
-        except ProviderStreamError as e:
-            # Known provider-side error
-            bus.logger.error(
-                "summary_stream_provider_error",
-                extra={
-                    "document_id": str(document_id),
-                    "request_id": req_id,
-                    "error": str(e),
-                },
-            )
-            yield EVENT_ERROR
-            yield DATA_PREFIX + json.dumps(
-                {"message": _map_provider_error_message(e)}
-            ) + "\n\n"
-        except Exception as e:
-            # Unexpected error surface as generic message
-            bus.logger.exception(
-                "summary_stream_unhandled_error",
-                extra={"document_id": str(document_id), "request_id": req_id},
-            )
-            yield EVENT_ERROR
-            yield DATA_PREFIX + json.dumps(
-                {"message": "Unexpected error. Please try again."}
-            ) + "\n\n"
-
-    headers = {
-        "Cache-Control": "no-cache",
-        "Connection": "keep-alive",
-        "Content-Type": "text/event-stream",
-        "X-Accel-Buffering": "no",
+        yield writer.event(
+            EVENT_OPEN,
+            {
+                "document_id": str(document_id),
+                "request_id": req_id,
+                "stream_id": stream_id,
+                "resumed": resumed is not None,
+            },
+            _event_id(stream_id, start),
+        )
+        for item in summary_streams.follow(stream_id, start, writer.idle_s):
+            if item[0] == STREAM_END:
+                current = item[1]
+                break
+            if writer.expired:
+                yield writer.event(EVENT_ERROR, {"message": "stream timeout"})
+                bus.logger.warning("summary_stream_timeout", extra=log_extra)
+                return
+            if item[0] == STREAM_QUEUE:
+                yield writer.event(EVENT_QUEUE, {"position": item[1]})
+            elif item[0] == STREAM_CHUNK:
+                _, idx, chunk = item
+                frame = writer.chunk(chunk, idx, _event_id(stream_id, idx + 1))
+                if frame:
+                    yield frame
+            else:
+                frame = writer.tick()
+                if frame:
+                    yield frame
+
+        if current["status"] == jobs.JOB_DONE:
+            yield writer.event(EVENT_DONE, {"source_hash": current.get("source_hash")})
+            bus.logger.info("summary_stream_done", extra=log_extra)
+            return
+        bus.logger.error(
+            "summary_stream_error",
+            extra=dict(
+                log_extra, error=current.get("error"), error_type=current["error_type"]
+            ),
+        )
+        yield writer.event(EVENT_ERROR, {"message": _job_error_message(current)})
+
+    return Response(stream_with_context(event_stream()), headers=SSE_HEADERS)
+
+
+def _job_error_message(job: dict) -> str:
+    if job.get("error_type") == "NoConfigForTenant":
+        return NO_TENANT_CONFIG_MESSAGE
+    if job.get("error_type") == "DocumentNotFound":
+        return job["error"]
+    if job.get("error_type") == "ProviderStreamError":
+        return _map_provider_error_message(
+            ProviderStreamError(job.get("error") or "", kind=job.get("error_kind"))
+        )
+    return "Unexpected error. Please try again."
+
+
+def job_payload(job: dict) -> dict:
+    payload = {
+        "job_id": job["job_id"],
+        "document_id": job["document_id"],
+        "status": job["status"],
     }
-    return Response(stream_with_context(event_stream()), headers=headers)
+    if job["status"] == jobs.JOB_ERROR:
+        payload["message"] = _job_error_message(job)
+    if job.get("queue_position") and job["status"] == jobs.JOB_RUNNING:
+        payload["queue_position"] = job["queue_position"]
+    return payload
+
+
+def find_summary_job(document_id: UUID, job_id: UUID) -> dict:
+    job = jobs.summary_job_store.get(str(job_id))
+    if (
+        not job
+        or job["document_id"] != str(document_id)
+        or job["tenant"] != get_current_tenant()
+    ):
+        raise SummaryJobNotFound(str(job_id))
+    return job
+
+
+@summary_blueprint.post("/<uuid:document_id>/summary/jobs")
+def enqueue_summary_job(document_id: UUID):
+    options = request.get_json(silent=True) or {}
+    job = tasks.enqueue_summary_job(document_id, options)
+    return jsonify(job_payload(job)), 202
+
+
+@summary_blueprint.get("/<uuid:document_id>/summary/jobs/<uuid:job_id>")
+def get_summary_job(document_id: UUID, job_id: UUID):
+    return jsonify(job_payload(find_summary_job(document_id, job_id))), 200
+
+
+@summary_blueprint.get("/<uuid:document_id>/summary/jobs/<uuid:job_id>/stream")
+def stream_summary_job(document_id: UUID, job_id: UUID):
+    # Tails the job's shared chunk buffer; the provider call runs on a worker
+    job = find_summary_job(document_id, job_id)
+    req_id = getattr(g, "request_id", None)
+    writer = SseWriter(_stream_timeout_s(job.get("options") or {}))
+    poll_s = float(os.getenv("SUMMARY_JOB_POLL_S", "0.25"))
+    store = jobs.summary_job_store
+
+    def event_stream():
+        yield writer.event(
+            EVENT_OPEN,
+            {
+                "document_id": str(document_id),
+                "job_id": str(job_id),
+                "request_id": req_id,
+            },
+        )
+        index = 0
+        while True:
+            current = store.get(str(job_id)) or {"status": jobs.JOB_ERROR}
+            # Read chunks after the status so a finished job is fully drained
+            for chunk in store.read_chunks(str(job_id), index):
+                frame = writer.chunk(chunk, index)
+                if frame:
+                    yield frame
+                index += 1
+            if current["status"] == jobs.JOB_DONE:
+                yield writer.event(
+                    EVENT_DONE, {"source_hash": current.get("source_hash")}
+                )
+                return
+            if current["status"] == jobs.JOB_ERROR:
+                yield writer.event(
+                    EVENT_ERROR, {"message": _job_error_message(current)}
+                )
+                return
+            if writer.expired:
+                yield writer.event(EVENT_ERROR, {"message": "stream timeout"})
+                return
+            frame = writer.tick()
+            if frame:
+                yield frame
+            time.sleep(min(poll_s, writer.idle_s))
+
+    return Response(stream_with_context(event_stream()), headers=SSE_HEADERS)
 
 
 @summary_blueprint.get("/<uuid:document_id>/summary")
 def get_summary(document_id: UUID):
-    bus = bus_factory()
-    with bus.uow as uow:
+    with read_only_uow_factory() as uow:
         doc = uow.repositories.documents.get(document_id)
         if not doc:
             from components.documents.application.errors import DocumentNotFound
@@ -157,7 +271,11 @@ def get_summary(document_id: UUID):
 def save_summary(document_id: UUID, payload: schemas.SaveSummaryRequest):
     bus = bus_factory()
     bus.handle(
-        commands.SaveSummary(document_id=document_id, content_html=payload.content_html)
+        commands.SaveSummary(
+            document_id=document_id,
+            content_html=payload.content_html,
+            source_hash=payload.source_hash,
+        )
     )
     return "OK", 201
 
@@ -168,7 +286,9 @@ def update_summary(document_id: UUID, payload: schemas.UpdateSummaryRequest):
     bus = bus_factory()
     bus.handle(
         commands.UpdateSummary(
-            document_id=document_id, content_html=payload.content_html
+            document_id=document_id,
+            content_html=payload.content_html,
+            source_hash=payload.source_hash,
         )
     )
     return "OK", 200
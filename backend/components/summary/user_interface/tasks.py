@@ -0,0 +1,41 @@
+import threading
+from uuid import UUID
+
+from celery import shared_task
+from flask import current_app
+
+from components.shared.infrastructure.tenant import (
+    get_current_tenant,
+    set_current_tenant,
+)
+from components.summary.application.jobs import new_summary_job, summary_job_store
+from components.summary.application.summary_service import SummaryService
+from components.summary.user_interface.bus import bus_factory
+
+
+@shared_task(name="summary.generate", ignore_result=True)
+def generate_summary_job(tenant: str, job_id: str, document_id: str, options: dict):
+    run_summary_job(tenant, job_id, document_id, options)
+
+
+def run_summary_job(tenant: str, job_id: str, document_id: str, options: dict):
+    # Workers have no request, so the tenant travels with the job
+    set_current_tenant(tenant)
+    bus = bus_factory()
+    SummaryService.run_summary_job(
+        job_id, UUID(document_id), options, bus.uow, bus.logger
+    )
+
+
+def enqueue_summary_job(document_id: UUID, options: dict) -> dict:
+    tenant = get_current_tenant()
+    job = new_summary_job(tenant, document_id, options)
+    summary_job_store.create(job)
+
+    args = (tenant, job["job_id"], str(document_id), options)
+    if "celery" in current_app.extensions:
+        generate_summary_job.delay(*args)
+    else:
+        # No broker configured (local development): run on a background thread
+        threading.Thread(target=run_summary_job, args=args, daemon=True).start()
+    return job
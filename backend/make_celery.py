@@ -0,0 +1,8 @@
+from app import app
+
+# Worker entrypoint: celery -A make_celery worker --loglevel INFO
+celery_app = app.extensions.get("celery")
+if celery_app is None:
+    raise RuntimeError(
+        "Celery is not configured: set CELERY_BROKER_URL before starting a worker"
+    )
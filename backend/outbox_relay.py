@@ -0,0 +1,55 @@
+"""Outbox relay worker: publishes committed domain events to the event broker.
+
+Run one or more per deployment, e.g. `python outbox_relay.py`; tenants come
+from OUTBOX_TENANTS. EVENT_PUBLISHER_BACKEND must name a real broker: the
+in-memory publisher would mark rows published that no consumer ever reads.
+"""
+
+import signal
+import threading
+
+from components.documents.application.handler_maps import (
+    EVENT_TOPIC_MAPS as DOCUMENTS_EVENT_TOPIC_MAPS,
+)
+from components.shared.application.event_publisher import build_event_publisher
+from components.shared.infrastructure.logger import logger
+from components.shared.infrastructure.os import env
+from components.shared.infrastructure.outbox import OutboxRelay
+from components.summary.application.handler_maps import (
+    EVENT_TOPIC_MAPS as SUMMARY_EVENT_TOPIC_MAPS,
+)
+
+
+def event_topics() -> dict:
+    return {
+        event_type._name: topic
+        for maps in (DOCUMENTS_EVENT_TOPIC_MAPS, SUMMARY_EVENT_TOPIC_MAPS)
+        for event_type, topic in maps.items()
+    }
+
+
+def main() -> int:
+    tenants = env.list("OUTBOX_TENANTS", [])
+    if not tenants:
+        logger.error("OUTBOX_TENANTS is empty, nothing to relay")
+        return 1
+
+    backend = env.str("EVENT_PUBLISHER_BACKEND", "").lower()
+    if backend in ("", "memory"):
+        logger.error(
+            "EVENT_PUBLISHER_BACKEND must be set to a broker (e.g. redis), "
+            "the in-memory publisher would drop every relayed event"
+        )
+        return 1
+
+    stop = threading.Event()
+    signal.signal(signal.SIGTERM, lambda *_: stop.set())
+    signal.signal(signal.SIGINT, lambda *_: stop.set())
+
+    logger.info(f"Outbox relay started for tenants {tenants}")
+    OutboxRelay(build_event_publisher(backend), event_topics()).run(tenants, stop)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
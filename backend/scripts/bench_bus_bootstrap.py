@@ -0,0 +1,89 @@
+"""Micro-benchmark: cost of building a request's MessageBus.
+
+Compares the previous per-request wiring (``inspect.signature`` and a closure
+for every handler) with the compiled handler tables now used by the
+bootstrappers. The unit of work is a placeholder, so only wiring is measured.
+
+Usage (from backend/): python scripts/bench_bus_bootstrap.py [iterations]
+"""
+
+import inspect
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from components.documents import bootstrapper as documents_bootstrapper  # noqa: E402
+from components.shared.application.message_bus import MessageBus  # noqa: E402
+from components.shared.infrastructure.logger import logger  # noqa: E402
+from components.summary import bootstrapper as summary_bootstrapper  # noqa: E402
+
+
+class _PlaceholderUnitOfWork:
+    def collect_new_events(self):
+        return []
+
+
+def _legacy_bootstrap(module, uow) -> MessageBus:
+    dependencies = dict(uow=uow, logger=logger)
+
+    def inject(handler):
+        params = inspect.signature(handler).parameters
+        deps = {name: dep for name, dep in dependencies.items() if name in params}
+        return lambda message: handler(message, **deps)
+
+    return MessageBus(
+        uow=uow,
+        event_handlers={
+            event_type: [inject(handler) for handler in handlers]
+            for event_type, handlers in module.EVENT_HANDLER_MAPS.items()
+        },
+        command_handlers={
+            command_type: inject(handler)
+            for command_type, handler in module.COMMAND_HANDLER_MAPS.items()
+        },
+        logger=logger,
+    )
+
+
+def _compiled_bootstrap(module, uow) -> MessageBus:
+    return module.Bootstrapper().bootstrap(uow_factory=uow, logger=logger)
+
+
+def _dispatch_one(bus: MessageBus) -> None:
+    # A request resolves at least one handler; include that in the cost
+    bus.command_handlers[next(iter(bus.command_handlers))]
+
+
+def main() -> int:
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    uow = _PlaceholderUnitOfWork()
+    for name, module in (
+        ("documents", documents_bootstrapper),
+        ("summary", summary_bootstrapper),
+    ):
+        legacy = min(
+            timeit.repeat(
+                lambda: _dispatch_one(_legacy_bootstrap(module, uow)),
+                number=iterations,
+                repeat=5,
+            )
+        )
+        compiled = min(
+            timeit.repeat(
+                lambda: _dispatch_one(_compiled_bootstrap(module, uow)),
+                number=iterations,
+                repeat=5,
+            )
+        )
+        print(
+            f"{name:<10} legacy {legacy / iterations * 1e6:8.2f} us/bus  "
+            f"compiled {compiled / iterations * 1e6:8.2f} us/bus  "
+            f"x{legacy / compiled:.1f}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
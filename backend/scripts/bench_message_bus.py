@@ -0,0 +1,130 @@
+"""Micro-benchmark: MessageBus dispatch of a command that cascades into events.
+
+A bulk command raises one event on each of ``count`` entities and every event
+raises a follow-up until ``depth`` is reached, while the unit of work has
+``seen`` entities loaded. Compares the previous bus (list queue, collection
+walking every seen entity after each handler) with the current one (deque,
+collection visiting only entities that raised events). No database is used.
+
+Usage (from backend/): python scripts/bench_message_bus.py [count] [depth] [seen]
+"""
+
+import os
+import sys
+import time
+import uuid
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from components.shared.application.message_bus import MessageBus  # noqa: E402
+from components.shared.domain.base import Command, Entity, Event  # noqa: E402
+from components.shared.infrastructure.logger import logger  # noqa: E402
+from components.shared.infrastructure.sqlalchemy_base import (  # noqa: E402
+    SQLAlchemyAbstractRepository,
+    SqlAlchemyUnitOfWork,
+)
+
+
+class _Item(Entity):
+    def __init__(self):
+        self.id = uuid.uuid4()
+
+
+class _Touched(Event):
+    _name = "bench.touched"
+
+    def __init__(self, item: _Item, depth: int):
+        self.item = item
+        self.depth = depth
+
+
+class _TouchAll(Command):
+    count: int
+    depth: int
+
+
+class _Items(SQLAlchemyAbstractRepository):
+    pass
+
+
+class _NullSession:
+    def rollback(self):
+        pass
+
+    def close(self):
+        pass
+
+
+class _QuietLogger:
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: None
+
+
+class _LegacyUnitOfWork(SqlAlchemyUnitOfWork):
+    def collect_new_events(self):
+        for repository in self.repositories.__dict__.values():
+            repository.raised.clear()
+            for model in repository.seen:
+                while model.events:
+                    yield model.events.pop(0)
+
+
+class _LegacyMessageBus(MessageBus):
+    def handle(self, message) -> None:
+        queue = [message]
+        self._queue = queue
+        while queue:
+            message = queue.pop(0)
+            if isinstance(message, Event):
+                self.handle_event(message)
+            else:
+                self.handle_command(message)
+
+
+def _run(uow_class, bus_class, count: int, depth: int, seen: int) -> float:
+    uow = uow_class(session_factory=_NullSession, logger=logger, items=_Items)
+    with uow:
+        items = [_Item() for _ in range(max(count, seen))]
+        for item in items:
+            uow.repositories.items._track(item)
+
+        def touch_all(command: _TouchAll):
+            for item in items[: command.count]:
+                item.raise_event(_Touched(item, 0))
+
+        def touched(event: _Touched):
+            if event.depth < depth:
+                event.item.raise_event(_Touched(event.item, event.depth + 1))
+
+        bus = bus_class(
+            uow=uow,
+            logger=_QuietLogger(),
+            event_handlers={_Touched: [touched]},
+            command_handlers={_TouchAll: touch_all},
+        )
+        started = time.perf_counter()
+        bus.handle(_TouchAll(count=count, depth=depth))
+        return time.perf_counter() - started
+
+
+def main() -> int:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    depth = int(sys.argv[2]) if len(sys.argv) > 2 else 3
+    seen = int(sys.argv[3]) if len(sys.argv) > 3 else 5000
+    messages = 1 + count * (depth + 1)
+
+    legacy = min(
+        _run(_LegacyUnitOfWork, _LegacyMessageBus, count, depth, seen) for _ in range(3)
+    )
+    current = min(
+        _run(SqlAlchemyUnitOfWork, MessageBus, count, depth, seen) for _ in range(3)
+    )
+    print(f"{messages} messages, {seen} seen entities")
+    print(f"legacy  {legacy * 1e3:9.1f} ms  {legacy / messages * 1e6:8.2f} us/msg")
+    print(f"current {current * 1e3:9.1f} ms  {current / messages * 1e6:8.2f} us/msg")
+    print(f"x{legacy / current:.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,4 @@
+#!/bin/bash
+
+# Summary SSE streams on an event loop; the Flask app keeps serving the rest
+uvicorn asgi:app --host 0.0.0.0 --port "${ASGI_PORT:-3004}" --workers "${ASGI_WORKERS:-2}"
@@ -0,0 +1,4 @@
+#!/bin/bash
+
+# Publishes committed domain events from each tenant's outbox to the event broker
+python outbox_relay.py
@@ -1,7 +1,7 @@
 import { apiClient } from './http_client';
 
-export const getDocumentCollection = async ({ signal } = {}) => {
-  return await apiClient.get('/documents/', { signal });
+export const getDocumentCollection = async ({ cursor, limit, signal } = {}) => {
+  return await apiClient.get('/documents/', { params: { cursor, limit }, signal });
 };
 
 export const createDocument = async (payload, { signal } = {}) => {
@@ -67,22 +67,22 @@ export async function getSummary(documentId) {
   return await res.json();
 }
 
-export async function saveSummary(documentId, content_html) {
+export async function saveSummary(documentId, content_html, source_hash = null) {
   const url = `${baseApi()}/documents/${documentId}/summary`;
   const res = await fetch(url, {
     method: 'POST',
     headers: getHeaders('application/json'),
-    body: JSON.stringify({ content_html }),
+    body: JSON.stringify({ content_html, source_hash }),
   });
   if (!res.ok) throw new Error(`Failed to save summary: ${res.status}`);
 }
 
-export async function updateSummary(documentId, content_html) {
+export async function updateSummary(documentId, content_html, source_hash = null) {
   const url = `${baseApi()}/documents/${documentId}/summary`;
   const res = await fetch(url, {
     method: 'PUT',
     headers: getHeaders('application/json'),
-    body: JSON.stringify({ content_html }),
+    body: JSON.stringify({ content_html, source_hash }),
   });
   if (!res.ok) throw new Error(`Failed to update summary: ${res.status}`);
 }
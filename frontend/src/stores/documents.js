@@ -13,6 +13,8 @@ export const useDocumentsStore = defineStore('documents', () => {
 
   // Internal: de-dupe concurrent fetches
   let pendingFetch = null;
+  // Largest page the API serves
+  const PAGE_SIZE = 200;
 
   // Getters
   const documentsList = computed(() => allIds.value.map((id) => byId.value[id]).filter(Boolean));
@@ -50,10 +52,19 @@ export const useDocumentsStore = defineStore('documents', () => {
     }
     isLoading.value = true;
     error.value = null;
-    pendingFetch = api
-      .getDocumentCollection({ signal })
-      .then((res) => {
-        const items = res?.data?.items || [];
+    // The API is cursor-paginated; follow next_cursor until the last page
+    const fetchAllPages = async () => {
+      const items = [];
+      let cursor;
+      do {
+        const res = await api.getDocumentCollection({ cursor, limit: PAGE_SIZE, signal });
+        items.push(...(res?.data?.items || []));
+        cursor = res?.data?.next_cursor;
+      } while (cursor);
+      return items;
+    };
+    pendingFetch = fetchAllPages()
+      .then((items) => {
         upsertMany(items);
         lastFetchedAt.value = Date.now();
       })